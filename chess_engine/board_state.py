@@ -29,3 +29,6 @@ def find_king(board, color):
             if board[row][col] == target:
                 return row, col
     return None
+
+
+PIECE_CODES = tuple(color + piece_type for color in "wb" for piece_type in "PNBRQK")
@@ -0,0 +1,205 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+
+from chess_engine.game import Game
+from chess_engine.models import encode_move, packed_from_square, packed_promotion, packed_to_square
+from chess_engine.pgn import parse_san, read_games
+
+# Records follow the Polyglot layout: big-endian key, move, weight and learn
+# fields, sorted by key so a lookup is a binary search over the mapped file.
+# Keys are the engine's own Zobrist position_hash rather than the Polyglot
+# Random64 table, and moves use the models.encode_move packing, so books must
+# be built with build_book().
+_RECORD = struct.Struct(">QHHI")
+_KEY = struct.Struct(">Q")
+RECORD_SIZE = _RECORD.size
+MAX_WEIGHT = 0xFFFF
+DEFAULT_MAX_PLY = 24
+
+# Results credited to the side that played the move: a win counts double, a
+# loss not at all, and unfinished games count like a draw.
+_RESULT_POINTS = {
+    "1-0": {"w": 2, "b": 0},
+    "0-1": {"w": 0, "b": 2},
+}
+
+
+def book_move_to_uci(packed):
+    token = "".join(
+        Game.coords_to_square(*divmod(square, 8))
+        for square in (packed_from_square(packed), packed_to_square(packed))
+    )
+    promotion = packed_promotion(packed)
+    return token + promotion.lower() if promotion else token
+
+
+class OpeningBook:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.size = size // RECORD_SIZE
+        self._map = None
+        if self.size:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._file.close()
+                raise
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def _key_at(self, index):
+        return _KEY.unpack_from(self._map, index * RECORD_SIZE)[0]
+
+    def _first_index(self, key):
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def entries(self, key):
+        if self._map is None:
+            return []
+        found = []
+        index = self._first_index(key)
+        while index < self.size:
+            entry_key, move, weight, _ = _RECORD.unpack_from(self._map, index * RECORD_SIZE)
+            if entry_key != key:
+                break
+            if weight:
+                found.append((book_move_to_uci(move), weight))
+            index += 1
+        return found
+
+    def legal_entries(self, game):
+        # Re-checking each move against the position guards against hash
+        # collisions and books built from a different rules engine.
+        entries = []
+        for token, weight in self.entries(game.position_hash):
+            move, _ = game.parse_uci_move(token)
+            if move is not None:
+                entries.append((token, weight))
+        return entries
+
+    def choose(self, game, level="hard", rng=None):
+        entries = self.legal_entries(game)
+        if not entries:
+            return None
+        if level == "very_hard":
+            return max(entries, key=lambda entry: entry[1])[0]
+
+        # Easy flattens the weights so sidelines come up more often.
+        exponent = 0.5 if level == "easy" else 1.0
+        weights = [weight ** exponent for _, weight in entries]
+        rng = rng or random
+        return rng.choices([token for token, _ in entries], weights=weights)[0]
+
+
+def _scaled_weights(counts):
+    top = max(counts.values(), default=0)
+    scale = MAX_WEIGHT / top if top > MAX_WEIGHT else 1
+    for (key, move), points in counts.items():
+        weight = int(points * scale)
+        if weight:
+            yield key, move, weight
+
+
+def build_book(lines, output_path, max_ply=DEFAULT_MAX_PLY):
+    # Games that do not replay cleanly contribute the plies before the bad
+    # move. Returns counts for reporting.
+    counts = {}
+    stats = {"games": 0, "positions": 0, "entries": 0}
+    for record in read_games(lines):
+        headers = record.get("headers", {})
+        try:
+            game = Game.from_fen(headers["FEN"]) if headers.get("FEN") else Game()
+        except ValueError:
+            continue
+        stats["games"] += 1
+        points = _RESULT_POINTS.get(record.get("result"), {"w": 1, "b": 1})
+
+        for san in record.get("moves", [])[:max_ply]:
+            try:
+                move, promotion = parse_san(game, san)
+            except ValueError:
+                break
+            entry = (game.position_hash, encode_move(move, promotion))
+            counts[entry] = counts.get(entry, 0) + points[game.turn]
+            game.commit_move(move, promotion)
+
+    records = sorted(_scaled_weights(counts), key=lambda item: (item[0], -item[2], item[1]))
+    with open(output_path, "wb") as sink:
+        for key, move, weight in records:
+            sink.write(_RECORD.pack(key, move, weight, 0))
+
+    stats["positions"] = len({key for key, _, _ in records})
+    stats["entries"] = len(records)
+    return stats
+
+
+_book_lock = threading.Lock()
+_book = None
+_book_path = None
+
+
+def get_opening_book(path=None):
+    # Opened lazily from CHESS_BOOK_PATH; a missing or unreadable book just
+    # means the engine searches from the first move.
+    global _book, _book_path
+
+    path = path if path is not None else os.getenv("CHESS_BOOK_PATH", "").strip()
+    if not path:
+        return None
+    with _book_lock:
+        if _book_path != path:
+            if _book is not None:
+                _book.close()
+            try:
+                _book = OpeningBook(path)
+            except OSError:
+                _book = None
+            _book_path = path
+        return _book
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an opening book from a PGN file.")
+    parser.add_argument("input", help="PGN file to read")
+    parser.add_argument("-o", "--output", required=True, help="book file to write")
+    parser.add_argument("--max-ply", type=int, default=DEFAULT_MAX_PLY)
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding="utf-8", errors="replace") as source:
+        stats = build_book(source, args.output, max(1, args.max_ply))
+    print(
+        f"{stats['games']} games, {stats['positions']} positions, "
+        f"{stats['entries']} book moves written to {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
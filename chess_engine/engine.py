@@ -1,6 +1,17 @@
+import multiprocessing
 import os
 import random
-from copy import deepcopy
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chess_engine.board_state import find_king
+from chess_engine.book import get_opening_book
+from chess_engine.evaluation import compute_eval_terms, evaluate, evaluate_batch
+from chess_engine.models import decode_move, encode_move
+from chess_engine.rules.attacks import pinned_squares
+from chess_engine.rules.draws import build_position_key
+from chess_engine.stockfish_pool import get_stockfish_pool
 
 
 PIECE_VALUES = {
@@ -12,147 +23,576 @@ PIECE_VALUES = {
     "K": 0,
 }
 
+MATE_SCORE = 100000
+MAX_SEARCH_DEPTH = 64
+HARD_SEARCH_DEPTH = 3
+_TIME_CHECK_INTERVAL = 512
+PROMOTION_ORDER = ("Q", "N", "R", "B")
+
+ASPIRATION_MIN_DEPTH = 4
+ASPIRATION_WINDOW = 50
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+FUTILITY_DEPTH = 2
+FUTILITY_MARGIN = 150
+RAZOR_MARGIN = 300
+DELTA_MARGIN = 200
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_LATE_MOVES = 8
+# Quiet moves searched per node before the rest are pruned, by depth.
+LATE_MOVE_COUNTS = (0, 8, 14)
+
+DEFAULT_TT_ENTRIES = 1 << 16
+MIN_TT_ENTRIES = 1 << 10
+MAX_TT_ENTRIES = 1 << 22
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+DEFAULT_ANALYSIS_TIME_MS = 200
+
+
+def _evaluate_position(game, perspective, alpha=None, beta=None):
+    # Terminal positions are scored by the search itself, so leaves only need
+    # the static terms.
+    return evaluate(game, perspective, alpha, beta)
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    # Each bucket holds a depth-preferred slot and an always-replace slot.
+    # Entries are (key, depth, bound, score, best_move, generation) tuples.
+    def __init__(self, entries=DEFAULT_TT_ENTRIES):
+        self.entries = max(2, int(entries))
+        self.bucket_count = self.entries // 2
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        self._deep = [None] * self.bucket_count
+        self._recent = [None] * self.bucket_count
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        index = key % self.bucket_count
+        entry = self._deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self._recent[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
 
-def _opponent(color):
-    return "b" if color == "w" else "w"
-
-
-def _material_balance(board, perspective):
-    own = 0
-    opp = 0
-
-    for row in board:
-        for piece in row:
-            if piece == ".":
-                continue
-            value = PIECE_VALUES.get(piece[1], 0)
-            if piece[0] == perspective:
-                own += value
-            else:
-                opp += value
-
-    return own - opp
+    def store(self, key, depth, bound, score, best_move):
+        index = key % self.bucket_count
+        entry = (key, depth, bound, score, best_move, self.generation)
+        current = self._deep[index]
+        self.stores += 1
+
+        if (
+            current is None
+            or current[0] == key
+            or current[5] != self.generation
+            or depth >= current[1]
+        ):
+            self._deep[index] = entry
+        else:
+            self._recent[index] = entry
 
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / probes, 4) if probes else 0.0,
+        }
 
-def _evaluate_position(game, perspective):
-    side_to_move = game.turn
-    opponent = _opponent(side_to_move)
 
-    if game.is_checkmate(side_to_move):
-        return -10000 if side_to_move == perspective else 10000
+_tt_lock = threading.Lock()
+_shared_tt = None
 
-    if game.is_stalemate(side_to_move):
-        return 0
 
-    score = _material_balance(game.board, perspective) * 10
+def _configured_tt_entries():
+    try:
+        entries = int(os.getenv("CHESS_TT_ENTRIES", DEFAULT_TT_ENTRIES))
+    except (TypeError, ValueError):
+        entries = DEFAULT_TT_ENTRIES
+    return max(MIN_TT_ENTRIES, min(MAX_TT_ENTRIES, entries))
+
+
+def get_transposition_table():
+    # One table per worker, sized once from CHESS_TT_ENTRIES and shared by
+    # every search it runs.
+    global _shared_tt
+
+    with _tt_lock:
+        if _shared_tt is None:
+            _shared_tt = TranspositionTable(_configured_tt_entries())
+        return _shared_tt
+
+
+def transposition_table_stats():
+    with _tt_lock:
+        table = _shared_tt
+    if table is None:
+        table = get_transposition_table()
+    return table.stats()
+
+
+def _score_to_tt(score, ply):
+    # Mate scores are stored relative to the node so they stay valid when the
+    # same position is reached at a different ply.
+    if score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_SEARCH_DEPTH:
+        return score - ply
+    return score
 
-    if game.is_in_check(_opponent(perspective)):
-        score += 3
-    if game.is_in_check(perspective):
-        score -= 3
 
+def _score_from_tt(score, ply):
+    if score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_SEARCH_DEPTH:
+        return score + ply
     return score
 
 
-def _fallback_easy(game):
-    legal = game.get_legal_moves(game.turn)
-    if not legal:
-        return None, "none"
-    move, promotion = random.choice(legal)
-    return game.move_to_uci(move, promotion), "fallback"
+def _move_key(move, promotion):
+    return encode_move(move, promotion)
 
 
-def _fallback_hard(game):
-    legal = game.get_legal_moves(game.turn)
-    if not legal:
-        return None, "none"
+def _capture_gain(move, promotion):
+    gain = 100 * PIECE_VALUES[move.target[1]] if move.target else 0
+    if promotion:
+        gain += 100 * (PIECE_VALUES[promotion] - 1)
+    return gain
 
-    legal = game.get_legal_moves(game.turn)
 
-    best_score = None
-    best_tokens = []
+def _capture_order(move, promotion):
+    score = 0
+    if move.target:
+        score += 10 * PIECE_VALUES.get(move.target[1], 0) - PIECE_VALUES.get(move.piece[1], 0)
+    if promotion:
+        score += PIECE_VALUES.get(promotion, 0)
+    return score
 
-    for move, promotion in legal:
-        score = 0.0
 
-        if move.target:
-            score += PIECE_VALUES.get(move.target[1], 0)
+class _Search:
+    def __init__(self, game, think_time_ms, max_depth=None, should_stop=None, tt=None):
+        self.game = game
+        # Recomputed once so a board edited in place cannot leave a stale hash
+        # or stale terms behind the evaluation caches.
+        game.position_hash = build_position_key(
+            game.board, game.turn, game.castling_rights, game.en_passant_target
+        )
+        game.eval_terms = compute_eval_terms(game.board)
+        self.tt = tt if tt is not None else get_transposition_table()
+        self.deadline = time.perf_counter() + max(1, think_time_ms) / 1000.0
+        self.max_depth = max_depth or MAX_SEARCH_DEPTH
+        self.should_stop = should_stop
+        self.nodes = 0
+        self.killers = {}
+        self.history = {}
+        self.can_stop = False
+        self.root_best = None
+
+    def _check_time(self):
+        # Cancellation is honoured from the first node; the think-time budget
+        # only once depth 1 has produced a move.
+        self.nodes += 1
+        if self.nodes % _TIME_CHECK_INTERVAL:
+            return
+        if self.should_stop and self.should_stop():
+            raise _SearchTimeout()
+        if self.can_stop and time.perf_counter() >= self.deadline:
+            raise _SearchTimeout()
+
+    def _king_safety(self):
+        game = self.game
+        king_pos = find_king(game.board, game.turn)
+        if king_pos is None:
+            return None, True, set()
+        in_check = game.is_square_attacked(
+            game.board, king_pos[0], king_pos[1], game.opponent(game.turn)
+        )
+        pinned = set() if in_check else pinned_squares(game.board, *king_pos, game.turn)
+        return king_pos, in_check, pinned
+
+    def _is_legal(self, move, promotion, king_pos, in_check, pinned):
+        # Outside check only king moves, en passant and pinned pieces can
+        # expose the king, so everything else skips the make/test/unmake.
+        if (
+            in_check
+            or move.piece[1] == "K"
+            or move.special == "en_passant"
+            or (move.sr, move.sc) in pinned
+        ):
+            return not self.game.would_leave_king_in_check(move, promotion or "Q", king_pos)
+        return True
+
+    def _has_pieces(self, color):
+        return any(
+            piece[0] == color and piece[1] in "NBRQ" for row in self.game.board for piece in row
+        )
+
+    def _order_moves(self, moves, ply, first_key=None):
+        killers = self.killers.get(ply, ())
+        history = self.history
+
+        def priority(entry):
+            move, promotion = entry
+            if first_key is not None and _move_key(move, promotion) == first_key:
+                return 1 << 30
+            if move.is_capture or promotion:
+                return (1 << 20) + _capture_order(move, promotion)
+            key = _move_key(move, promotion)
+            if key in killers:
+                return 1 << 19
+            return history.get(key, 0)
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+    def _node_moves(self, ply, tt_move):
+        # The hash move is tried before anything is generated; a cutoff on it
+        # saves the full generation and sort.
+        game = self.game
+        if tt_move is not None:
+            move, promotion = decode_move(tt_move, game.board)
+            move = game.build_move(move.sr, move.sc, move.dr, move.dc, color=game.turn)
+            if move is not None and bool(move.promotion) == (promotion is not None):
+                yield move, promotion
+
+        moves = []
+        for move in game.generate_pseudo_legal_moves():
+            if move.promotion:
+                moves.extend((move, option) for option in PROMOTION_ORDER)
+            else:
+                moves.append((move, None))
+        for entry in self._order_moves(moves, ply):
+            if tt_move is None or _move_key(*entry) != tt_move:
+                yield entry
+
+    def _record_cutoff(self, move, promotion, depth, ply):
+        if move.is_capture or promotion:
+            return
+        key = _move_key(move, promotion)
+        killers = self.killers.setdefault(ply, [])
+        if key not in killers:
+            killers.insert(0, key)
+            del killers[2:]
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def quiescence(self, alpha, beta, ply):
+        self._check_time()
+        game = self.game
+
+        stand_pat = _evaluate_position(game, game.turn, alpha, beta)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [
+            (move, "Q" if move.promotion else None)
+            for move in game.generate_pseudo_legal_captures()
+        ]
+        if not captures:
+            return alpha
+
+        captures.sort(key=lambda entry: _capture_order(*entry), reverse=True)
+        king_pos = None
+        opponent = game.opponent(game.turn)
+        for move, promotion in captures:
+            # Delta pruning: even winning the piece outright cannot lift the
+            # score to alpha.
+            if stand_pat + _capture_gain(move, promotion) + DELTA_MARGIN <= alpha:
+                continue
+            # A defended piece taken by a more valuable one rarely pays.
+            if (
+                not promotion
+                and PIECE_VALUES[move.piece[1]] > PIECE_VALUES[move.target[1]]
+                and game.is_square_attacked(game.board, move.dr, move.dc, opponent)
+            ):
+                continue
+            # Few captures survive the pruning, so each is checked directly
+            # rather than working out pins for the whole node.
+            if king_pos is None:
+                king_pos = find_king(game.board, game.turn)
+            if game.would_leave_king_in_check(move, promotion or "Q", king_pos):
+                continue
+            record = game.make_move(move, promotion)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            game.unmake_move(record)
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        return alpha
+
+    def negamax(self, depth, alpha, beta, ply, allow_null=True):
+        game = self.game
+
+        if ply and (
+            game.position_counts.get(game.position_hash, 0) > 1 or game.halfmove_clock >= 100
+        ):
+            return 0
+
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply)
+
+        self._check_time()
+        key = game.position_hash
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                bound = entry[2]
+                score = _score_from_tt(entry[3], ply)
+                if bound == TT_EXACT:
+                    return score
+                if bound == TT_LOWER and score >= beta:
+                    return score
+                if bound == TT_UPPER and score <= alpha:
+                    return score
+
+        king_pos, in_check, pinned = self._king_safety()
+        static_eval = None
+        if not in_check and abs(beta) < MATE_SCORE - MAX_SEARCH_DEPTH:
+            static_eval = _evaluate_position(game, game.turn, alpha, beta)
+            # Reverse futility: near the horizon a big enough lead holds.
+            if depth <= FUTILITY_DEPTH and static_eval - FUTILITY_MARGIN * depth >= beta:
+                return static_eval
+            # Razoring: one ply from the horizon and far below alpha, only a
+            # capture can help, so drop straight into quiescence.
+            if depth == 1 and static_eval + RAZOR_MARGIN <= alpha:
+                return self.quiescence(alpha, beta, ply)
+
+        # Null move: if passing still fails high, a real move would too.
+        # Skipped in check and without pieces, where zugzwang is likely.
+        if (
+            allow_null
+            and static_eval is not None
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and static_eval >= beta
+            and self._has_pieces(game.turn)
+        ):
+            record = game.make_null_move()
+            score = -self.negamax(
+                depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, allow_null=False
+            )
+            game.unmake_null_move(record)
+            if score >= beta:
+                return beta
+
+        # Futility: quiet moves near the horizon that cannot reach alpha
+        # are skipped once one move has been searched. Late-move pruning
+        # likewise drops the tail of the quiet moves at depths 1 and 2.
+        futile = (
+            static_eval is not None
+            and depth <= FUTILITY_DEPTH
+            and static_eval + FUTILITY_MARGIN * depth <= alpha
+        )
 
-        if promotion:
-            score += PIECE_VALUES.get(promotion, 0) * 0.2
+        original_alpha = alpha
+        best_score = -MATE_SCORE - 1
+        best_move = None
+        searched = 0
+        for move, promotion in self._node_moves(ply, tt_move):
+            if not self._is_legal(move, promotion, king_pos, in_check, pinned):
+                continue
+            if searched and not move.is_capture and not promotion and (
+                futile
+                or (
+                    depth < len(LATE_MOVE_COUNTS)
+                    and not in_check
+                    and searched >= LATE_MOVE_COUNTS[depth]
+                )
+            ):
+                continue
+            searched += 1
+            record = game.make_move(move, promotion)
+            if searched == 1:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            else:
+                # Late quiet moves are searched shallower with a null window
+                # and only re-searched in full when they beat alpha.
+                reduction = 0
+                if (
+                    depth >= LMR_MIN_DEPTH
+                    and searched > LMR_MIN_MOVES
+                    and not in_check
+                    and not move.is_capture
+                    and not promotion
+                ):
+                    reduction = 2 if depth >= 4 and searched > LMR_LATE_MOVES else 1
+                score = -self.negamax(depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+                if score > alpha and (reduction or score < beta):
+                    score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move(record)
+
+            if score > best_score:
+                best_score = score
+                best_move = _move_key(move, promotion)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._record_cutoff(move, promotion, depth, ply)
+                break
+
+        if not searched:
+            return -MATE_SCORE + ply if in_check else 0
+
+        if best_score <= original_alpha:
+            bound = TT_UPPER
+        elif best_score >= beta:
+            bound = TT_LOWER
+        else:
+            bound = TT_EXACT
+        self.tt.store(key, depth, bound, _score_to_tt(best_score, ply), best_move)
 
-        token = game.move_to_uci(move, promotion)
+        return best_score
 
-        if best_score is None or score > best_score:
-            best_score = score
-            best_tokens = [token]
-        elif score == best_score:
-            best_tokens.append(token)
+    def search_root(self, moves, depth, best_key, alpha=-MATE_SCORE - 1, beta=MATE_SCORE + 1):
+        game = self.game
+        best = None
 
-    return random.choice(best_tokens), "fallback"
+        for move, promotion in self._order_moves(moves, 0, best_key):
+            record = game.make_move(move, promotion)
+            if best is None:
+                score = -self.negamax(depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self.negamax(depth - 1, -alpha - 1, -alpha, 1)
+                if score > alpha:
+                    score = -self.negamax(depth - 1, -beta, -alpha, 1)
+            game.unmake_move(record)
+
+            if best is None or score > best[0]:
+                best = (score, move, promotion)
+                if depth == 1:
+                    self.root_best = best
+            if score > alpha:
+                alpha = score
+
+        return best
+
+    def _result(self, best, depth):
+        score, move, promotion = best
+        return {
+            "move": self.game.move_to_uci(move, promotion),
+            "score": score,
+            "depth": depth,
+            "nodes": self.nodes,
+        }
+
+    def run(self):
+        game = self.game
+        moves = game.get_legal_moves()
+        if not moves:
+            return None
+
+        self.tt.new_search()
+        result = None
+        best_key = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = None
+                if result is not None and depth >= ASPIRATION_MIN_DEPTH:
+                    # Aspiration window around the last score; a result on
+                    # or outside its edge is re-searched with a full window.
+                    alpha = result["score"] - ASPIRATION_WINDOW
+                    beta = result["score"] + ASPIRATION_WINDOW
+                    best = self.search_root(list(moves), depth, best_key, alpha, beta)
+                    if not alpha < best[0] < beta:
+                        best = None
+                if best is None:
+                    best = self.search_root(list(moves), depth, best_key)
+            except _SearchTimeout:
+                # Stopped inside depth 1: fall back to the best root move
+                # scored so far, or the first one in move order.
+                if result is None:
+                    best = self.root_best or (0, *self._order_moves(list(moves), 0)[0])
+                    result = self._result(best, 0)
+                break
+
+            best_key = _move_key(best[1], best[2])
+            result = self._result(best, depth)
+            self.can_stop = True
+
+            if abs(best[0]) >= MATE_SCORE - MAX_SEARCH_DEPTH:
+                break
+            if time.perf_counter() >= self.deadline:
+                break
+
+        return result
+
+
+def search_best_move(game, think_time_ms=250, max_depth=None, should_stop=None, tt=None):
+    return _Search(game.copy(), think_time_ms, max_depth, should_stop, tt).run()
 
 
-def _fallback_very_hard(game):
+def _fallback_easy(game):
     legal = game.get_legal_moves(game.turn)
     if not legal:
         return None, "none"
+    move, promotion = random.choice(legal)
+    return game.move_to_uci(move, promotion), "fallback"
 
-    perspective = game.turn
-    best_score = None
-    best_tokens = []
-
-    for move, promotion in legal:
-        token = game.move_to_uci(move, promotion)
-        sim = deepcopy(game)
-        if not sim.apply_uci_move(token):
-            continue
-
-        opponent_legal = sim.get_legal_moves(sim.turn)
-        if not opponent_legal:
-            score = _evaluate_position(sim, perspective)
-        else:
-            # 1-ply response search (engine move + opponent best reply).
-            reply_scores = []
-            for reply_move, reply_promo in opponent_legal:
-                reply_token = sim.move_to_uci(reply_move, reply_promo)
-                sim_reply = deepcopy(sim)
-                if not sim_reply.apply_uci_move(reply_token):
-                    continue
-                reply_scores.append(_evaluate_position(sim_reply, perspective))
-
-            score = min(reply_scores) if reply_scores else _evaluate_position(sim, perspective)
-
-        if best_score is None or score > best_score:
-            best_score = score
-            best_tokens = [token]
-        elif score == best_score:
-            best_tokens.append(token)
-
-    if not best_tokens:
-        return _fallback_hard(game)
 
-    return random.choice(best_tokens), "fallback"
+def _fallback_search(game, think_time_ms, max_depth=None, should_stop=None):
+    result = search_best_move(
+        game,
+        think_time_ms=think_time_ms,
+        max_depth=max_depth,
+        should_stop=should_stop,
+        tt=get_transposition_table(),
+    )
+    if result is None:
+        return None, "none"
+    return result["move"], "fallback"
 
 
-def _stockfish_choose_move(game, skill_level=10, think_time_ms=250):
+def _stockfish_choose_move(game, skill_level=10, think_time_ms=250, game_key=None, pool=None):
     try:
         import chess
         import chess.engine
     except Exception:
         return None
 
-    path = os.getenv("STOCKFISH_PATH", "stockfish")
+    pool = pool or get_stockfish_pool()
 
     try:
         board = chess.Board(game.to_fen())
-        with chess.engine.SimpleEngine.popen_uci(path) as engine:
+        with pool.lease() as engine:
             try:
                 engine.configure({"Skill Level": max(0, min(20, int(skill_level)))})
             except Exception:
                 pass
 
             think_seconds = max(0.05, float(think_time_ms) / 1000.0)
-            result = engine.play(board, chess.engine.Limit(time=think_seconds))
+            # A changed game key makes python-chess send ucinewgame first.
+            result = engine.play(
+                board,
+                chess.engine.Limit(time=think_seconds),
+                game=game_key if game_key is not None else id(game),
+            )
             if result and result.move:
                 return result.move.uci(), "stockfish"
     except Exception:
@@ -173,26 +613,51 @@ def _level_settings(level):
     return normalized, 12, 300
 
 
-def _fallback_choose_move(game, level):
+def _fallback_choose_move(game, level, think_time_ms, should_stop=None):
     if level == "easy":
         return _fallback_easy(game)
     if level == "very_hard":
-        return _fallback_very_hard(game)
-    return _fallback_hard(game)
-
-
-def choose_engine_move(game, skill_level=10, think_time_ms=250, use_stockfish=True, level="hard"):
+        return _fallback_search(
+            game,
+            think_time_ms,
+            should_stop=should_stop,
+        )
+    return _fallback_search(
+        game,
+        think_time_ms,
+        max_depth=HARD_SEARCH_DEPTH,
+        should_stop=should_stop,
+    )
+
+
+def choose_engine_move(
+    game,
+    skill_level=10,
+    think_time_ms=250,
+    use_stockfish=True,
+    level="hard",
+    game_key=None,
+    should_stop=None,
+    use_book=True,
+):
     level, level_skill, level_time = _level_settings(level)
     if skill_level is None:
         skill_level = level_skill
     if think_time_ms is None:
         think_time_ms = level_time
 
+    if use_book:
+        book = get_opening_book()
+        move_token = book.choose(game, level) if book is not None else None
+        if move_token:
+            return move_token, "book"
+
     if use_stockfish:
         stockfish_result = _stockfish_choose_move(
             game,
             skill_level=skill_level,
             think_time_ms=think_time_ms,
+            game_key=game_key,
         )
         if stockfish_result is not None:
             move_token, source = stockfish_result
@@ -200,4 +665,137 @@ def choose_engine_move(game, skill_level=10, think_time_ms=250, use_stockfish=Tr
             if move is not None:
                 return move_token, source
 
-    return _fallback_choose_move(game, level)
+    return _fallback_choose_move(game, level, think_time_ms, should_stop)
+
+
+_analysis_lock = threading.Lock()
+_analysis_pool = None
+_analysis_pool_workers = None
+
+
+def _analysis_workers(workers=None):
+    if workers is None:
+        workers = os.getenv("CHESS_ANALYSIS_WORKERS", os.cpu_count() or 1)
+    try:
+        return max(1, int(workers))
+    except (TypeError, ValueError):
+        return os.cpu_count() or 1
+
+
+def get_analysis_pool(workers=None):
+    # Spawned rather than forked: the web app has live threads (job workers,
+    # registry sweeper) whose locks a forked child would inherit mid-state.
+    global _analysis_pool, _analysis_pool_workers
+
+    workers = _analysis_workers(workers)
+    with _analysis_lock:
+        if _analysis_pool is None or _analysis_pool_workers != workers:
+            if _analysis_pool is not None:
+                _analysis_pool.shutdown(wait=False)
+            _analysis_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _analysis_pool_workers = workers
+        return _analysis_pool
+
+
+def _build_analysis_game(item):
+    from chess_engine.game import Game
+
+    if isinstance(item, str):
+        item = {"fen": item}
+    if not isinstance(item, dict):
+        raise ValueError("Each item must be a FEN string or an object with fen/moves.")
+
+    fen = item.get("fen")
+    if fen is not None and not isinstance(fen, str):
+        raise ValueError("fen must be a string.")
+    game = Game.from_fen(fen) if fen else Game()
+
+    moves = item.get("moves") or []
+    if isinstance(moves, str):
+        moves = moves.split()
+    if not isinstance(moves, (list, tuple)):
+        raise ValueError("moves must be a list or a space-separated string.")
+    for ply, token in enumerate(moves, start=1):
+        if not game.apply_uci_move(str(token)):
+            raise ValueError(f"Illegal move at ply {ply}: {token}")
+    return game
+
+
+def _analyze_item(args):
+    index, item, think_time_ms, max_depth = args
+    try:
+        game = _build_analysis_game(item)
+    except ValueError as exc:
+        return {"index": index, "error": str(exc)}
+
+    outcome = game.get_outcome()
+    result = {
+        "index": index,
+        "fen": game.to_fen(),
+        "turn": game.turn,
+        "best_move": None,
+        "score": None,
+        "depth": 0,
+        "nodes": 0,
+        "outcome": outcome,
+    }
+    if outcome["ended"]:
+        return result
+
+    searched = search_best_move(
+        game,
+        think_time_ms=think_time_ms,
+        max_depth=max_depth,
+        tt=get_transposition_table(),
+    )
+    if searched is not None:
+        result["best_move"] = searched["move"]
+        result["score"] = searched["score"]
+        result["depth"] = searched["depth"]
+        result["nodes"] = searched["nodes"]
+    return result
+
+
+def analyze_positions(items, think_time_ms=DEFAULT_ANALYSIS_TIME_MS, max_depth=None, workers=None):
+    # Items are FEN strings or {"fen": ..., "moves": [uci, ...]} dicts.
+    # Results come back in input order; bad items get an "error" entry
+    # instead of failing the batch. Scores are centipawns for the side to move.
+    tasks = [(index, item, think_time_ms, max_depth) for index, item in enumerate(items)]
+    if not tasks:
+        return []
+
+    workers = _analysis_workers(workers)
+    if workers == 1 or len(tasks) == 1:
+        return [_analyze_item(task) for task in tasks]
+
+    pool = get_analysis_pool(workers)
+    chunksize = max(1, len(tasks) // (workers * 4))
+    return list(pool.map(_analyze_item, tasks, chunksize=chunksize))
+
+
+def score_positions(items):
+    # Static counterpart of analyze_positions(): no search, just the
+    # material + piece-square score of every position in one vectorised
+    # call. Scores are centipawns for the side to move.
+    results = []
+    games = []
+    for index, item in enumerate(items):
+        try:
+            game = _build_analysis_game(item)
+        except ValueError as exc:
+            results.append({"index": index, "error": str(exc)})
+            continue
+        results.append({"index": index, "fen": game.to_fen(), "turn": game.turn})
+        games.append((len(results) - 1, game))
+
+    scores = evaluate_batch(
+        [game.board for _, game in games],
+        perspectives=[game.turn for _, game in games],
+    )
+    for (position, game), score in zip(games, scores):
+        results[position]["score"] = score
+        results[position]["outcome"] = game.get_outcome()
+    return results
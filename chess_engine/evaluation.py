@@ -0,0 +1,417 @@
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from chess_engine.board_state import PIECE_CODES
+from chess_engine.pieces.bishop import DIRECTIONS as BISHOP_DIRECTIONS
+from chess_engine.pieces.knight import OFFSETS as KNIGHT_OFFSETS
+from chess_engine.pieces.queen import DIRECTIONS as QUEEN_DIRECTIONS
+from chess_engine.pieces.rook import DIRECTIONS as ROOK_DIRECTIONS
+from chess_engine.rules.zobrist import PIECE_KEYS
+
+# Tapered evaluation: every term has a middlegame and an endgame value, and
+# the two are blended by how much non-pawn material is left. Values and
+# tables follow the PeSTO layout, white's view, row 0 = rank 8, so a black
+# piece reads its table vertically mirrored.
+MG_VALUES = {"P": 82, "N": 337, "B": 365, "R": 477, "Q": 1025, "K": 0}
+EG_VALUES = {"P": 94, "N": 281, "B": 297, "R": 512, "Q": 936, "K": 0}
+PHASE_WEIGHTS = {"P": 0, "N": 1, "B": 1, "R": 2, "Q": 4, "K": 0}
+MAX_PHASE = 24
+
+MG_TABLES = {
+    "P": (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        98, 134, 61, 95, 68, 126, 34, -11,
+        -6, 7, 26, 31, 65, 56, 25, -20,
+        -14, 13, 6, 21, 23, 12, 17, -23,
+        -27, -2, -5, 12, 17, 6, 10, -25,
+        -26, -4, -4, -10, 3, 3, 33, -12,
+        -35, -1, -20, -23, -15, 24, 38, -22,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    "N": (
+        -167, -89, -34, -49, 61, -97, -15, -107,
+        -73, -41, 72, 36, 23, 62, 7, -17,
+        -47, 60, 37, 65, 84, 129, 73, 44,
+        -9, 17, 19, 53, 37, 69, 18, 22,
+        -13, 4, 16, 13, 28, 19, 21, -8,
+        -23, -9, 12, 10, 19, 17, 25, -16,
+        -29, -53, -12, -3, -1, 18, -14, -19,
+        -105, -21, -58, -33, -17, -28, -19, -23,
+    ),
+    "B": (
+        -29, 4, -82, -37, -25, -42, 7, -8,
+        -26, 16, -18, -13, 30, 59, 18, -47,
+        -16, 37, 43, 40, 35, 50, 37, -2,
+        -4, 5, 19, 50, 37, 37, 7, -2,
+        -6, 13, 13, 26, 34, 12, 10, 4,
+        0, 15, 15, 15, 14, 27, 18, 10,
+        4, 15, 16, 0, 7, 21, 33, 1,
+        -33, -3, -14, -21, -13, -12, -39, -21,
+    ),
+    "R": (
+        32, 42, 32, 51, 63, 9, 31, 43,
+        27, 32, 58, 62, 80, 67, 26, 44,
+        -5, 19, 26, 36, 17, 45, 61, 16,
+        -24, -11, 7, 26, 24, 35, -8, -20,
+        -36, -26, -12, -1, 9, -7, 6, -23,
+        -45, -25, -16, -17, 3, 0, -5, -33,
+        -44, -16, -20, -9, -1, 11, -6, -71,
+        -19, -13, 1, 17, 16, 7, -37, -26,
+    ),
+    "Q": (
+        -28, 0, 29, 12, 59, 44, 43, 45,
+        -24, -39, -5, 1, -16, 57, 28, 54,
+        -13, -17, 7, 8, 29, 56, 47, 57,
+        -27, -27, -16, -16, -1, 17, -2, 1,
+        -9, -26, -9, -10, -2, -4, 3, -3,
+        -14, 2, -11, -2, -5, 2, 14, 5,
+        -35, -8, 11, 2, 8, 15, -3, 1,
+        -1, -18, -9, 10, -15, -25, -31, -50,
+    ),
+    "K": (
+        -65, 23, 16, -15, -56, -34, 2, 13,
+        29, -1, -20, -7, -8, -4, -38, -29,
+        -9, 24, 2, -16, -20, 6, 22, -22,
+        -17, -20, -12, -27, -30, -25, -14, -36,
+        -49, -1, -27, -39, -46, -44, -33, -51,
+        -14, -14, -22, -46, -44, -30, -15, -27,
+        1, 7, -8, -64, -43, -16, 9, 8,
+        -15, 36, 12, -54, 8, -28, 24, 14,
+    ),
+}
+
+EG_TABLES = {
+    "P": (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        178, 173, 158, 134, 147, 132, 165, 187,
+        94, 100, 85, 67, 56, 53, 82, 84,
+        32, 24, 13, 5, -2, 4, 17, 17,
+        13, 9, -3, -7, -7, -8, 3, -1,
+        4, 7, -6, 1, 0, -5, -1, -8,
+        13, 8, 8, 10, 13, 0, 2, -7,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    "N": (
+        -58, -38, -13, -28, -31, -27, -63, -99,
+        -25, -8, -25, -2, -9, -25, -24, -52,
+        -24, -20, 10, 9, -1, -9, -19, -41,
+        -17, 3, 22, 22, 22, 11, 8, -18,
+        -18, -6, 16, 25, 16, 17, 4, -18,
+        -23, -3, -1, 15, 10, -3, -20, -22,
+        -42, -20, -10, -5, -2, -20, -23, -44,
+        -29, -51, -23, -15, -22, -18, -50, -64,
+    ),
+    "B": (
+        -14, -21, -11, -8, -7, -9, -17, -24,
+        -8, -4, 7, -12, -3, -13, -4, -14,
+        2, -8, 0, -1, -2, 6, 0, 4,
+        -3, 9, 12, 9, 14, 10, 3, 2,
+        -6, 3, 13, 19, 7, 10, -3, -9,
+        -12, -3, 8, 10, 13, 3, -7, -15,
+        -14, -18, -7, -1, 4, -9, -15, -27,
+        -23, -9, -23, -5, -9, -16, -5, -17,
+    ),
+    "R": (
+        13, 10, 18, 15, 12, 12, 8, 5,
+        11, 13, 13, 11, -3, 3, 8, 3,
+        7, 7, 7, 5, 4, -3, -5, -3,
+        4, 3, 13, 1, 2, 1, -1, 2,
+        3, 5, 8, 4, -5, -6, -8, -11,
+        -4, 0, -5, -1, -7, -12, -8, -16,
+        -6, -6, 0, 2, -9, -9, -11, -3,
+        -9, 2, 3, -1, -5, -13, 4, -20,
+    ),
+    "Q": (
+        -9, 22, 22, 27, 27, 19, 10, 20,
+        -17, 20, 32, 41, 58, 25, 30, 0,
+        -20, 6, 9, 49, 47, 35, 19, 9,
+        3, 22, 24, 45, 57, 40, 57, 36,
+        -18, 28, 19, 47, 31, 34, 39, 23,
+        -16, -27, 15, 6, 9, 17, 10, 5,
+        -22, -23, -30, -16, -16, -23, -36, -32,
+        -33, -28, -22, -43, -5, -32, -20, -41,
+    ),
+    "K": (
+        -74, -35, -18, -18, -11, 15, 4, -17,
+        -12, 17, 14, 17, 17, 38, 23, 11,
+        10, 17, 23, 15, 20, 45, 44, 13,
+        -8, 22, 24, 27, 26, 33, 26, 3,
+        -18, -4, 21, 24, 27, 23, 9, -11,
+        -19, -3, 11, 21, 23, 16, 7, -9,
+        -27, -11, 4, 13, 14, 4, -5, -17,
+        -53, -34, -21, -11, -28, -14, -24, -43,
+    ),
+}
+
+DOUBLED_PAWN = (-10, -20)
+ISOLATED_PAWN = (-10, -15)
+# Indexed by ranks advanced from the pawn's start square.
+PASSED_PAWN_MG = (0, 5, 10, 15, 25, 40, 60, 0)
+PASSED_PAWN_EG = (0, 10, 20, 35, 60, 90, 130, 0)
+MOBILITY_WEIGHTS = {"N": (4, 4), "B": (5, 5), "R": (2, 4), "Q": (1, 2)}
+# Mobility is the only per-leaf scan; when the cheap terms already miss the
+# search window by more than this, it cannot change the result.
+LAZY_MARGIN = 150
+PAWN_CACHE_SIZE = 1 << 14
+MOBILITY_CACHE_SIZE = 1 << 14
+
+
+def _rays(directions, single_step=False):
+    rays = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        square_rays = []
+        for dr, dc in directions:
+            ray = []
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append((r, c))
+                if single_step:
+                    break
+                r += dr
+                c += dc
+            if ray:
+                square_rays.append(tuple(ray))
+        rays.append(tuple(square_rays))
+    return tuple(rays)
+
+
+_MOBILITY_RAYS = {
+    "N": _rays(KNIGHT_OFFSETS, True),
+    "B": _rays(BISHOP_DIRECTIONS),
+    "R": _rays(ROOK_DIRECTIONS),
+    "Q": _rays(QUEEN_DIRECTIONS),
+}
+
+
+def _square_terms(piece, square):
+    # Signed (mg, eg, phase) contribution of one piece: white adds, black
+    # subtracts. Phase counts for both sides.
+    color, kind = piece[0], piece[1]
+    index = square if color == "w" else (7 - square // 8) * 8 + square % 8
+    mg = MG_VALUES[kind] + MG_TABLES[kind][index]
+    eg = EG_VALUES[kind] + EG_TABLES[kind][index]
+    if color == "b":
+        mg, eg = -mg, -eg
+    pawn_key = PIECE_KEYS[piece][square] if kind == "P" else 0
+    return (mg, eg, PHASE_WEIGHTS[kind], pawn_key)
+
+
+SQUARE_TERMS = {
+    piece: tuple(_square_terms(piece, square) for square in range(64)) for piece in PIECE_CODES
+}
+SQUARE_TERMS["."] = ((0, 0, 0, 0),) * 64
+
+
+def compute_eval_terms(board):
+    mg = eg = phase = pawn_key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != ".":
+                terms = SQUARE_TERMS[piece][row * 8 + col]
+                mg += terms[0]
+                eg += terms[1]
+                phase += terms[2]
+                pawn_key ^= terms[3]
+    return (mg, eg, phase, pawn_key)
+
+
+def update_eval_terms(terms, board, changes):
+    # Same contract as zobrist.update_hash: `changes` holds (row, col,
+    # previous) for every square the move touched.
+    mg, eg, phase, pawn_key = terms
+    for row, col, previous in changes:
+        square = row * 8 + col
+        old = SQUARE_TERMS[previous][square]
+        new = SQUARE_TERMS[board[row][col]][square]
+        mg += new[0] - old[0]
+        eg += new[1] - old[1]
+        phase += new[2] - old[2]
+        pawn_key ^= old[3] ^ new[3]
+    return (mg, eg, phase, pawn_key)
+
+
+def taper(mg, eg, phase):
+    phase = min(phase, MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+_pawn_cache = {}
+_mobility_cache = {}
+
+
+def _pawn_structure_uncached(board):
+    files = {"w": [[] for _ in range(8)], "b": [[] for _ in range(8)]}
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece[1:] == "P":
+                files[piece[0]][col].append(row)
+
+    mg = eg = 0
+    for color, sign in (("w", 1), ("b", -1)):
+        own = files[color]
+        enemy = files["b" if color == "w" else "w"]
+        for col in range(8):
+            rows = own[col]
+            if not rows:
+                continue
+            if len(rows) > 1:
+                mg += sign * DOUBLED_PAWN[0] * (len(rows) - 1)
+                eg += sign * DOUBLED_PAWN[1] * (len(rows) - 1)
+            if not (col > 0 and own[col - 1]) and not (col < 7 and own[col + 1]):
+                mg += sign * ISOLATED_PAWN[0] * len(rows)
+                eg += sign * ISOLATED_PAWN[1] * len(rows)
+
+            for row in rows:
+                blockers = [
+                    enemy_row
+                    for file in range(max(0, col - 1), min(7, col + 1) + 1)
+                    for enemy_row in enemy[file]
+                    if (enemy_row < row if color == "w" else enemy_row > row)
+                ]
+                if not blockers:
+                    advanced = 6 - row if color == "w" else row - 1
+                    mg += sign * PASSED_PAWN_MG[advanced]
+                    eg += sign * PASSED_PAWN_EG[advanced]
+    return mg, eg
+
+
+def pawn_structure(board, pawn_key):
+    # Pawn skeletons repeat across most of a search tree, so the scan is
+    # cached on a pawn-only zobrist key.
+    cached = _pawn_cache.get(pawn_key)
+    if cached is None:
+        if len(_pawn_cache) >= PAWN_CACHE_SIZE:
+            _pawn_cache.clear()
+        cached = _pawn_cache[pawn_key] = _pawn_structure_uncached(board)
+    return cached
+
+
+def mobility(board):
+    mg = eg = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece == "." or piece[1] not in MOBILITY_WEIGHTS:
+                continue
+            color, kind = piece[0], piece[1]
+            count = 0
+            for ray in _MOBILITY_RAYS[kind][row * 8 + col]:
+                for r, c in ray:
+                    target = board[r][c]
+                    if target == ".":
+                        count += 1
+                        continue
+                    if target[0] != color:
+                        count += 1
+                    break
+            weight_mg, weight_eg = MOBILITY_WEIGHTS[kind]
+            sign = 1 if color == "w" else -1
+            mg += sign * weight_mg * count
+            eg += sign * weight_eg * count
+    return mg, eg
+
+
+def _cached_mobility(board, position_hash):
+    # Iterative deepening revisits most leaves, so mobility is cached on the
+    # full position hash.
+    cached = _mobility_cache.get(position_hash)
+    if cached is None:
+        if len(_mobility_cache) >= MOBILITY_CACHE_SIZE:
+            _mobility_cache.clear()
+        cached = _mobility_cache[position_hash] = mobility(board)
+    return cached
+
+
+def evaluate(game, perspective, alpha=None, beta=None):
+    # Centipawns from `perspective`'s side. Material and piece-square terms
+    # come from game.eval_terms, kept up to date by make/unmake.
+    mg, eg, phase, pawn_key = game.eval_terms
+    pawn_mg, pawn_eg = pawn_structure(game.board, pawn_key)
+    mg += pawn_mg
+    eg += pawn_eg
+    sign = 1 if perspective == "w" else -1
+
+    if alpha is not None and beta is not None:
+        lazy = sign * taper(mg, eg, phase)
+        if lazy + LAZY_MARGIN <= alpha or lazy - LAZY_MARGIN >= beta:
+            return lazy
+
+    mobility_mg, mobility_eg = _cached_mobility(game.board, game.position_hash)
+    return sign * taper(mg + mobility_mg, eg + mobility_eg, phase)
+
+
+# Batch scoring: boards become N x 64 plane indices (one-hot, these are
+# N x 12 x 64 piece planes) and material + piece-square terms are summed
+# for all boards at once. Pawn structure and mobility are left to
+# evaluate(). Without NumPy the same numbers come from a per-board loop.
+PLANE_PIECES = ("wP", "wN", "wB", "wR", "wQ", "wK", "bP", "bN", "bB", "bR", "bQ", "bK")
+PLANE_INDEX = {piece: index for index, piece in enumerate(PLANE_PIECES)}
+PLANE_INDEX["."] = len(PLANE_PIECES)
+
+if np is not None:
+    # One row per plane plus a zero row for empty squares.
+    MG_PLANE_WEIGHTS = np.array(
+        [[SQUARE_TERMS[piece][square][0] for square in range(64)] for piece in PLANE_PIECES + (".",)],
+        dtype=np.int64,
+    )
+    EG_PLANE_WEIGHTS = np.array(
+        [[SQUARE_TERMS[piece][square][1] for square in range(64)] for piece in PLANE_PIECES + (".",)],
+        dtype=np.int64,
+    )
+    PHASE_PLANE_WEIGHTS = np.array(
+        [PHASE_WEIGHTS[piece[1]] for piece in PLANE_PIECES] + [0],
+        dtype=np.int64,
+    )
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for vectorized batch scoring.")
+
+
+def pack_square_codes(boards):
+    _require_numpy()
+    squares = chain.from_iterable(chain.from_iterable(boards))
+    return np.fromiter(
+        map(PLANE_INDEX.__getitem__, squares),
+        dtype=np.intp,
+        count=len(boards) * 64,
+    ).reshape(len(boards), 64)
+
+
+def _taper_arrays(mg, eg, phase):
+    phase = np.minimum(phase, MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def evaluate_square_codes(codes):
+    # Equivalent to a dot product of one-hot piece planes with the weights,
+    # without materialising them: each square just gathers its plane's weight.
+    columns = np.arange(64)
+    mg = MG_PLANE_WEIGHTS[codes, columns].sum(axis=1)
+    eg = EG_PLANE_WEIGHTS[codes, columns].sum(axis=1)
+    phase = PHASE_PLANE_WEIGHTS[codes].sum(axis=1)
+    return _taper_arrays(mg, eg, phase)
+
+
+def evaluate_batch(boards, perspectives=None):
+    # White-relative scores, or relative to perspectives[i] when given.
+    boards = list(boards)
+    if not boards:
+        return []
+
+    if np is None:
+        scores = [taper(*compute_eval_terms(board)[:3]) for board in boards]
+    else:
+        scores = evaluate_square_codes(pack_square_codes(boards)).tolist()
+
+    if perspectives is not None:
+        scores = [score if color == "w" else -score for score, color in zip(scores, perspectives)]
+    return scores
@@ -0,0 +1,110 @@
+import os
+import queue
+import threading
+from collections import deque
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_HEARTBEAT_SECONDS = 15
+DEFAULT_HISTORY_SIZE = 32
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def board_changes(before, after):
+    files = "abcdefgh"
+    changes = {}
+    for row in range(8):
+        for col in range(8):
+            if before[row][col] != after[row][col]:
+                changes[f"{files[col]}{8 - row}"] = after[row][col]
+    return changes
+
+
+class EventBroker:
+    # In-process fan-out of per-game events. Each subscriber gets a bounded
+    # queue; one that falls behind is dropped and sent None so its stream
+    # ends and the client reconnects for a fresh snapshot. The last few
+    # events per channel are also kept so pollers can ask for what changed
+    # after a given "version".
+    def __init__(self, queue_size=None, heartbeat_seconds=None, history_size=None):
+        self.queue_size = queue_size or _env_int("CHESS_EVENT_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        self.heartbeat_seconds = heartbeat_seconds or _env_int(
+            "CHESS_EVENT_HEARTBEAT_SECONDS", DEFAULT_HEARTBEAT_SECONDS
+        )
+        self.history_size = history_size or _env_int("CHESS_EVENT_HISTORY_SIZE", DEFAULT_HISTORY_SIZE)
+        self._channels = {}
+        self._history = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def subscribe(self, channel):
+        subscription = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+            history = self._history.get(channel)
+            if history is None:
+                history = self._history[channel] = deque(maxlen=self.history_size)
+            history.append(event)
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                self.unsubscribe(channel, subscription)
+                self._close(subscription)
+                self.dropped += 1
+
+        return len(subscribers)
+
+    def events_since(self, channel, version):
+        # None when the log no longer reaches back to `version`; the caller
+        # should fall back to a full snapshot.
+        with self._lock:
+            history = list(self._history.get(channel, ()))
+        if not history or history[0]["version"] > version + 1:
+            return None
+        return [event for event in history if event["version"] > version]
+
+    def forget(self, channel):
+        # Drops the history and ends open streams, so clients come back for a
+        # fresh snapshot.
+        with self._lock:
+            self._history.pop(channel, None)
+            subscribers = self._channels.pop(channel, ())
+        for subscription in subscribers:
+            self._close(subscription)
+
+    @staticmethod
+    def _close(subscription):
+        while True:
+            try:
+                subscription.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            subscription.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._channels.values())
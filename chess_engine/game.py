@@ -1,17 +1,28 @@
-import copy
-
 from chess_engine.board_state import create_initial_board, find_king
 from chess_engine.constants import PROMOTION_OPTIONS
+from chess_engine.evaluation import compute_eval_terms, update_eval_terms
 from chess_engine.models import Move
-from chess_engine.notation import convert_position, parse_move_input
+from chess_engine.notation import convert_position, parse_fen, parse_move_input
 from chess_engine.pieces import MOVE_VALIDATORS
-from chess_engine.pieces.pawn import is_attack_move as pawn_attack_move
 from chess_engine.rules.attacks import is_square_attacked as square_attacked_rule
 from chess_engine.rules.castling import get_castling_move_type
 from chess_engine.rules.draws import build_position_key, is_insufficient_material
-from chess_engine.rules.en_passant import is_en_passant_capture, next_en_passant_target
-from chess_engine.rules.move_application import apply_move_to_board, update_castling_rights
+from chess_engine.rules.en_passant import (
+    get_effective_en_passant_target,
+    is_en_passant_capture,
+    next_en_passant_target,
+)
+from chess_engine.rules.move_application import (
+    apply_move_to_board,
+    revert_board_changes,
+    update_castling_rights,
+)
+from chess_engine.rules.move_generation import (
+    generate_pseudo_legal_captures,
+    generate_pseudo_legal_moves,
+)
 from chess_engine.rules.promotion import needs_promotion, normalize_promotion_choice
+from chess_engine.rules.zobrist import SIDE_TO_MOVE_KEY, castling_key, en_passant_key, update_hash
 from chess_engine.ui import print_board
 
 
@@ -29,8 +40,53 @@ class Game:
         self.halfmove_clock = 0
         self.fullmove_number = 1
         self.position_counts = {}
+        self.position_hash = 0
+        self.eval_terms = None
         self._undo_stack = []
+        self._outcome_cache = None
+        self._legal_map_cache = None
+        # Bumped on every commit and undo, so it only ever moves forward.
+        self.version = 0
         self.record_position()
+        self.start_fen = self.to_fen()
+
+    @classmethod
+    def from_fen(cls, fen):
+        fields = parse_fen(fen)
+
+        game = cls()
+        game.board = fields["board"]
+        game.turn = fields["turn"]
+        game.castling_rights = fields["castling_rights"]
+        game.en_passant_target = fields["en_passant_target"]
+        game.halfmove_clock = fields["halfmove_clock"]
+        game.fullmove_number = fields["fullmove_number"]
+
+        if game.is_in_check(game.opponent(game.turn)):
+            raise ValueError("The side not to move cannot be in check.")
+
+        game.position_counts = {}
+        game.record_position()
+        game.start_fen = game.to_fen()
+        return game
+
+    def copy(self):
+        clone = Game.__new__(Game)
+        clone.board = [row[:] for row in self.board]
+        clone.turn = self.turn
+        clone.castling_rights = dict(self.castling_rights)
+        clone.en_passant_target = self.en_passant_target
+        clone.halfmove_clock = self.halfmove_clock
+        clone.fullmove_number = self.fullmove_number
+        clone.position_counts = dict(self.position_counts)
+        clone.position_hash = self.position_hash
+        clone.eval_terms = self.eval_terms
+        clone._undo_stack = []
+        clone._outcome_cache = self._outcome_cache
+        clone._legal_map_cache = self._legal_map_cache
+        clone.version = self.version
+        clone.start_fen = clone.to_fen()
+        return clone
 
     @staticmethod
     def opponent(color):
@@ -50,37 +106,24 @@ class Game:
         return convert_position(square)
 
     def get_position_key(self):
-        return build_position_key(
+        return self.position_hash
+
+    def _effective_en_passant_target(self):
+        return get_effective_en_passant_target(self.board, self.en_passant_target, self.turn)
+
+    def record_position(self):
+        self.position_hash = build_position_key(
             self.board,
             self.turn,
             self.castling_rights,
             self.en_passant_target,
         )
+        self.eval_terms = compute_eval_terms(self.board)
+        self._count_position(self.position_hash)
 
-    def record_position(self):
-        key = self.get_position_key()
+    def _count_position(self, key):
         self.position_counts[key] = self.position_counts.get(key, 0) + 1
 
-    def _snapshot(self):
-        return {
-            "board": copy.deepcopy(self.board),
-            "turn": self.turn,
-            "castling_rights": dict(self.castling_rights),
-            "en_passant_target": self.en_passant_target,
-            "halfmove_clock": self.halfmove_clock,
-            "fullmove_number": self.fullmove_number,
-            "position_counts": dict(self.position_counts),
-        }
-
-    def _restore_snapshot(self, snapshot):
-        self.board = copy.deepcopy(snapshot["board"])
-        self.turn = snapshot["turn"]
-        self.castling_rights = dict(snapshot["castling_rights"])
-        self.en_passant_target = snapshot["en_passant_target"]
-        self.halfmove_clock = snapshot["halfmove_clock"]
-        self.fullmove_number = snapshot["fullmove_number"]
-        self.position_counts = dict(snapshot["position_counts"])
-
     def is_threefold_repetition(self):
         return self.position_counts.get(self.get_position_key(), 0) >= 3
 
@@ -94,14 +137,7 @@ class Game:
         return self.halfmove_clock >= 150
 
     def is_square_attacked(self, board, row, col, attacker_color):
-        return square_attacked_rule(
-            board,
-            row,
-            col,
-            attacker_color,
-            MOVE_VALIDATORS,
-            pawn_attack_move,
-        )
+        return square_attacked_rule(board, row, col, attacker_color)
 
     def is_in_check(self, color, board=None):
         board = board if board is not None else self.board
@@ -195,10 +231,21 @@ class Game:
 
         return move
 
-    def would_leave_king_in_check(self, move, promotion_piece="Q"):
-        temp_board = copy.deepcopy(self.board)
-        apply_move_to_board(temp_board, move, promotion_piece)
-        return self.is_in_check(move.piece[0], temp_board)
+    def would_leave_king_in_check(self, move, promotion_piece="Q", king_pos=None):
+        color = move.piece[0]
+        if move.piece[1] == "K":
+            king_pos = (move.dr, move.dc)
+        elif king_pos is None:
+            king_pos = find_king(self.board, color)
+        if king_pos is None:
+            return True
+
+        changes = apply_move_to_board(self.board, move, promotion_piece)
+        in_check = self.is_square_attacked(
+            self.board, king_pos[0], king_pos[1], self.opponent(color)
+        )
+        revert_board_changes(self.board, changes)
+        return in_check
 
     def is_valid_move(self, piece, sr, sc, dr, dc, promotion_piece="Q"):
         move = self.build_move(sr, sc, dr, dc, color=piece[0])
@@ -206,32 +253,62 @@ class Game:
             return False
         return not self.would_leave_king_in_check(move, promotion_piece)
 
+    def generate_pseudo_legal_moves(self, color=None):
+        return generate_pseudo_legal_moves(
+            self.board,
+            color or self.turn,
+            self.castling_rights,
+            self.en_passant_target,
+            self.is_in_check,
+            self.is_square_attacked,
+        )
+
+    def generate_pseudo_legal_captures(self, color=None):
+        return generate_pseudo_legal_captures(
+            self.board,
+            color or self.turn,
+            self.en_passant_target,
+        )
+
     def get_legal_moves(self, color=None):
         color = color or self.turn
+        king_pos = find_king(self.board, color)
         legal = []
 
-        for sr in range(8):
-            for sc in range(8):
-                piece = self.board[sr][sc]
-                if piece == "." or piece[0] != color:
-                    continue
-
-                for dr in range(8):
-                    for dc in range(8):
-                        move = self.build_move(sr, sc, dr, dc, color=color)
-                        if move is None:
-                            continue
+        for move in self.generate_pseudo_legal_moves(color):
+            if self.would_leave_king_in_check(move, king_pos=king_pos):
+                continue
 
-                        if move.promotion:
-                            for option in sorted(PROMOTION_OPTIONS):
-                                if not self.would_leave_king_in_check(move, option):
-                                    legal.append((move, option))
-                        else:
-                            if not self.would_leave_king_in_check(move):
-                                legal.append((move, None))
+            if move.promotion:
+                for option in sorted(PROMOTION_OPTIONS):
+                    legal.append((move, option))
+            else:
+                legal.append((move, None))
 
         return legal
 
+    def get_legal_move_map(self):
+        # Keyed on the hash alone: legal moves depend only on the board, side
+        # to move, castling rights and en passant square, all of which it covers.
+        if self._legal_map_cache is None or self._legal_map_cache[0] != self.position_hash:
+            move_map = {}
+            for move, promotion in self.get_legal_moves():
+                if promotion not in (None, "Q"):
+                    continue
+                start = self.coords_to_square(move.sr, move.sc)
+                move_map.setdefault(start, []).append(
+                    {
+                        "to": self.coords_to_square(move.dr, move.dc),
+                        "promotion": bool(move.promotion),
+                    }
+                )
+            self._legal_map_cache = (self.position_hash, move_map)
+
+        return {
+            start: [dict(target) for target in targets]
+            for start, targets in self._legal_map_cache[1].items()
+        }
+
     def move_to_uci(self, move, promotion=None):
         token = self.coords_to_square(move.sr, move.sc) + self.coords_to_square(move.dr, move.dc)
         if move.promotion:
@@ -329,24 +406,10 @@ class Game:
         )
 
     def has_any_legal_moves(self, color):
-        for sr in range(8):
-            for sc in range(8):
-                piece = self.board[sr][sc]
-                if piece == "." or piece[0] != color:
-                    continue
-
-                for dr in range(8):
-                    for dc in range(8):
-                        move = self.build_move(sr, sc, dr, dc, color=color)
-                        if move is None:
-                            continue
-
-                        if move.promotion:
-                            for option in PROMOTION_OPTIONS:
-                                if not self.would_leave_king_in_check(move, option):
-                                    return True
-                        elif not self.would_leave_king_in_check(move):
-                            return True
+        king_pos = find_king(self.board, color)
+        for move in self.generate_pseudo_legal_moves(color):
+            if not self.would_leave_king_in_check(move, king_pos=king_pos):
+                return True
 
         return False
 
@@ -359,10 +422,117 @@ class Game:
     def is_insufficient_material(self):
         return is_insufficient_material(self.board)
 
-    def commit_move(self, move, promotion_piece=None):
-        self._undo_stack.append(self._snapshot())
+    def get_outcome(self):
+        # Cached per position: the key covers everything the draw and mate
+        # rules look at, so a stale entry can never be returned.
+        key = (
+            self.position_hash,
+            self.halfmove_clock,
+            self.position_counts.get(self.position_hash, 0),
+        )
+        if self._outcome_cache is None or self._outcome_cache[0] != key:
+            self._outcome_cache = (key, self._compute_outcome())
+        return dict(self._outcome_cache[1])
+
+    def _compute_outcome(self):
+        side_to_move = self.turn
+        check = self.is_in_check(side_to_move)
+        has_moves = self.has_any_legal_moves(side_to_move)
+
+        if check and not has_moves:
+            winner = self.opponent(side_to_move)
+            return {
+                "ended": True,
+                "result": "checkmate",
+                "winner": winner,
+                "message": f"Checkmate! {winner.upper()} wins.",
+                "check": True,
+            }
+
+        if not has_moves:
+            return {
+                "ended": True,
+                "result": "stalemate",
+                "winner": None,
+                "message": "Draw by stalemate.",
+                "check": False,
+            }
+
+        if self.is_insufficient_material():
+            return {
+                "ended": True,
+                "result": "insufficient_material",
+                "winner": None,
+                "message": "Draw by insufficient material.",
+                "check": check,
+            }
+
+        if self.is_fivefold_repetition():
+            return {
+                "ended": True,
+                "result": "fivefold_repetition",
+                "winner": None,
+                "message": "Draw by fivefold repetition.",
+                "check": check,
+            }
+
+        if self.is_seventy_five_move_draw():
+            return {
+                "ended": True,
+                "result": "seventy_five_move_rule",
+                "winner": None,
+                "message": "Draw by seventy-five-move rule.",
+                "check": check,
+            }
+
+        if self.is_threefold_repetition():
+            return {
+                "ended": True,
+                "result": "threefold_repetition",
+                "winner": None,
+                "message": "Draw by threefold repetition.",
+                "check": check,
+            }
+
+        if self.is_fifty_move_draw():
+            return {
+                "ended": True,
+                "result": "fifty_move_rule",
+                "winner": None,
+                "message": "Draw by fifty-move rule.",
+                "check": check,
+            }
+
+        return {
+            "ended": False,
+            "result": None,
+            "winner": None,
+            "message": f"{side_to_move.upper()} to move.",
+            "check": check,
+        }
+
+    def make_move(self, move, promotion_piece=None):
+        record = {
+            "move": move,
+            "promotion": promotion_piece,
+            "castling_rights": dict(self.castling_rights),
+            "en_passant_target": self.en_passant_target,
+            "halfmove_clock": self.halfmove_clock,
+            "fullmove_number": self.fullmove_number,
+            "position_hash": self.position_hash,
+            "eval_terms": self.eval_terms,
+        }
+
+        key = (
+            self.position_hash
+            ^ castling_key(self.castling_rights)
+            ^ en_passant_key(self._effective_en_passant_target())
+        )
+
         update_castling_rights(self.castling_rights, move)
-        apply_move_to_board(self.board, move, promotion_piece)
+        changes = apply_move_to_board(self.board, move, promotion_piece)
+        record["changes"] = changes
+        self.eval_terms = update_eval_terms(self.eval_terms, self.board, changes)
         self.en_passant_target = next_en_passant_target(move)
 
         if move.piece[1] == "P" or move.is_capture:
@@ -375,7 +545,57 @@ class Game:
         if moving_color == "b":
             self.fullmove_number += 1
 
-        self.record_position()
+        self.position_hash = (
+            update_hash(key, self.board, changes)
+            ^ SIDE_TO_MOVE_KEY
+            ^ castling_key(self.castling_rights)
+            ^ en_passant_key(self._effective_en_passant_target())
+        )
+        self._count_position(self.position_hash)
+        return record
+
+    def unmake_move(self, record):
+        key = self.position_hash
+        remaining = self.position_counts.get(key, 0) - 1
+        if remaining > 0:
+            self.position_counts[key] = remaining
+        else:
+            self.position_counts.pop(key, None)
+
+        revert_board_changes(self.board, record["changes"])
+        self.castling_rights.update(record["castling_rights"])
+        self.en_passant_target = record["en_passant_target"]
+        self.halfmove_clock = record["halfmove_clock"]
+        self.fullmove_number = record["fullmove_number"]
+        self.turn = record["move"].piece[0]
+        self.position_hash = record["position_hash"]
+        self.eval_terms = record["eval_terms"]
+
+    def make_null_move(self):
+        # Passes the turn for the search's null-move pruning. The position is
+        # not counted, so it can never take part in a repetition.
+        record = {
+            "en_passant_target": self.en_passant_target,
+            "position_hash": self.position_hash,
+        }
+        self.position_hash ^= en_passant_key(self._effective_en_passant_target()) ^ SIDE_TO_MOVE_KEY
+        self.en_passant_target = None
+        self.turn = self.opponent(self.turn)
+        return record
+
+    def unmake_null_move(self, record):
+        self.turn = self.opponent(self.turn)
+        self.en_passant_target = record["en_passant_target"]
+        self.position_hash = record["position_hash"]
+
+    def commit_move(self, move, promotion_piece=None):
+        self._undo_stack.append(self.make_move(move, promotion_piece))
+        self._outcome_cache = None
+        self._legal_map_cache = None
+        self.version += 1
+
+    def move_history(self):
+        return [(record["move"], record["promotion"]) for record in self._undo_stack]
 
     def undo_last_move(self, steps=1):
         try:
@@ -390,10 +610,13 @@ class Game:
         for _ in range(steps):
             if not self._undo_stack:
                 break
-            snapshot = self._undo_stack.pop()
-            self._restore_snapshot(snapshot)
+            self.unmake_move(self._undo_stack.pop())
+            self._outcome_cache = None
+            self._legal_map_cache = None
             undone += 1
 
+        if undone:
+            self.version += 1
         return undone
 
     def play(self):
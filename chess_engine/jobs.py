@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 32
+DEFAULT_RETENTION_SECONDS = 300
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+FINISHED_STATUSES = {DONE, FAILED, CANCELLED, TIMED_OUT}
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobTimedOut(Exception):
+    pass
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class Job:
+    def __init__(self, timeout_ms, metadata=None):
+        self.id = str(uuid.uuid4())
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.metadata = metadata or {}
+        self.created_at = time.time()
+        self.finished_at = None
+        self.deadline = time.monotonic() + timeout_ms / 1000.0
+        self._cancel_requested = threading.Event()
+        self._finished = threading.Event()
+        self._state_lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def cancel_requested(self):
+        return self._cancel_requested.is_set()
+
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    def should_stop(self):
+        return self.cancel_requested() or self.expired()
+
+    def raise_if_stopped(self):
+        if self.cancel_requested():
+            raise JobCancelled()
+        if self.expired():
+            raise JobTimedOut("Job timed out.")
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def _start(self):
+        # False when the job was already finished while it sat in the queue.
+        with self._state_lock:
+            if self.finished:
+                return False
+            self.status = RUNNING
+            return True
+
+    def _finish(self, status, result=None, error=None, only_if_queued=False):
+        with self._state_lock:
+            if self.finished or (only_if_queued and self.status != QUEUED):
+                return
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._finished.set()
+
+    def to_dict(self):
+        payload = {
+            "job_id": self.id,
+            "status": self.status,
+            **self.metadata,
+        }
+        if self.result is not None:
+            payload["result"] = self.result
+        if self.error is not None:
+            payload["error"] = self.error
+        return payload
+
+
+class JobQueue:
+    # Bounded background worker pool for slow engine searches. `fn` receives
+    # the Job, should poll job.should_stop() while working and call
+    # job.raise_if_stopped() before committing any side effects.
+    def __init__(self, max_workers=None, max_pending=None, retention_seconds=None):
+        self.max_workers = max_workers or _env_int("CHESS_ENGINE_WORKERS", DEFAULT_WORKERS)
+        self.max_pending = max_pending or _env_int("CHESS_ENGINE_MAX_PENDING", DEFAULT_MAX_PENDING)
+        self.retention_seconds = retention_seconds or _env_int(
+            "CHESS_JOB_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="engine-job",
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        stale = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def submit(self, fn, timeout_ms, metadata=None):
+        job = Job(timeout_ms, metadata)
+        with self._lock:
+            self._prune()
+            pending = sum(1 for queued in self._jobs.values() if not queued.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError("Engine queue is full.")
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job, fn):
+        try:
+            job.raise_if_stopped()
+            if not job._start():
+                return
+            result = fn(job)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except JobTimedOut as exc:
+            job._finish(TIMED_OUT, error=str(exc))
+        except Exception as exc:
+            job._finish(FAILED, error=str(exc) or "Job failed.")
+        else:
+            job._finish(DONE, result=result)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        # A job that expires before a worker picks it up is reported as timed
+        # out straight away rather than staying "queued".
+        if job is not None and job.expired():
+            job._finish(TIMED_OUT, error="Job timed out.", only_if_queued=True)
+        return job
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job._cancel_requested.set()
+        job._finish(CANCELLED, only_if_queued=True)
+        return job
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel_requested.set()
+        self._executor.shutdown(wait=wait)
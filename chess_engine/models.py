@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     sr: int
     sc: int
@@ -14,3 +14,91 @@ class Move:
     promotion: bool = False
     is_capture: bool = False
     capture_square: Optional[Tuple[int, int]] = None
+
+
+# Packed moves use 16 bits: from-square (6), to-square (6) and a 4-bit flag.
+# Squares are row * 8 + col, matching the list board.
+FLAG_QUIET = 0
+FLAG_DOUBLE_PAWN_PUSH = 1
+FLAG_CASTLE_KINGSIDE = 2
+FLAG_CASTLE_QUEENSIDE = 3
+FLAG_CAPTURE = 4
+FLAG_EN_PASSANT = 5
+FLAG_PROMOTION = 8
+FLAG_PROMOTION_CAPTURE = 12
+
+PROMOTION_PIECES = ("N", "B", "R", "Q")
+_PROMOTION_INDEX = {piece: index for index, piece in enumerate(PROMOTION_PIECES)}
+_SPECIAL_FLAGS = {
+    "castle_kingside": FLAG_CASTLE_KINGSIDE,
+    "castle_queenside": FLAG_CASTLE_QUEENSIDE,
+    "en_passant": FLAG_EN_PASSANT,
+}
+_FLAG_SPECIALS = {flag: special for special, flag in _SPECIAL_FLAGS.items()}
+
+
+def encode_move(move, promotion=None):
+    if move.promotion:
+        flag = FLAG_PROMOTION_CAPTURE if move.is_capture else FLAG_PROMOTION
+        flag += _PROMOTION_INDEX[(promotion or "Q").upper()]
+    elif move.special in _SPECIAL_FLAGS:
+        flag = _SPECIAL_FLAGS[move.special]
+    elif move.is_capture:
+        flag = FLAG_CAPTURE
+    elif move.piece[1] == "P" and abs(move.dr - move.sr) == 2:
+        flag = FLAG_DOUBLE_PAWN_PUSH
+    else:
+        flag = FLAG_QUIET
+
+    return (move.sr * 8 + move.sc) | ((move.dr * 8 + move.dc) << 6) | (flag << 12)
+
+
+def packed_from_square(packed):
+    return packed & 0x3F
+
+
+def packed_to_square(packed):
+    return (packed >> 6) & 0x3F
+
+
+def packed_flag(packed):
+    return packed >> 12
+
+
+def packed_promotion(packed):
+    flag = packed_flag(packed)
+    if flag & FLAG_PROMOTION:
+        return PROMOTION_PIECES[flag & 3]
+    return None
+
+
+def decode_move(packed, board):
+    sr, sc = divmod(packed_from_square(packed), 8)
+    dr, dc = divmod(packed_to_square(packed), 8)
+    flag = packed_flag(packed)
+    piece = board[sr][sc]
+    promotion = packed_promotion(packed)
+    special = _FLAG_SPECIALS.get(flag)
+
+    target = None
+    capture_square = None
+    if special == "en_passant":
+        capture_square = (sr, dc)
+        target = board[sr][dc]
+    elif flag == FLAG_CAPTURE or flag >= FLAG_PROMOTION_CAPTURE:
+        capture_square = (dr, dc)
+        target = board[dr][dc]
+
+    move = Move(
+        sr=sr,
+        sc=sc,
+        dr=dr,
+        dc=dc,
+        piece=piece,
+        target=target,
+        special=special,
+        promotion=promotion is not None,
+        is_capture=capture_square is not None,
+        capture_square=capture_square,
+    )
+    return move, promotion
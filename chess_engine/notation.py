@@ -38,3 +38,92 @@ def parse_move_input(command, turn):
         return start, end, promo
 
     raise ValueError("Invalid move format.")
+
+
+def parse_fen(fen):
+    fields = (fen or "").split()
+    if len(fields) == 4:
+        fields += ["0", "1"]
+    if len(fields) != 6:
+        raise ValueError("FEN must have six fields.")
+
+    placement, turn, castling, en_passant, halfmove, fullmove = fields
+
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError("FEN placement must have eight ranks.")
+
+    board = []
+    for rank in ranks:
+        row = []
+        for symbol in rank:
+            if symbol in "12345678":
+                row.extend(["."] * int(symbol))
+            elif symbol.upper() in "PNBRQK":
+                row.append(("w" if symbol.isupper() else "b") + symbol.upper())
+            else:
+                raise ValueError(f"Invalid FEN piece symbol: {symbol}.")
+        if len(row) != 8:
+            raise ValueError("Each FEN rank must describe eight squares.")
+        board.append(row)
+
+    for color in "wb":
+        kings = sum(row.count(color + "K") for row in board)
+        if kings != 1:
+            raise ValueError("Each side must have exactly one king.")
+    if any(piece[1:] == "P" for piece in board[0] + board[7]):
+        raise ValueError("Pawns cannot stand on the first or last rank.")
+
+    if turn not in {"w", "b"}:
+        raise ValueError("FEN side to move must be 'w' or 'b'.")
+
+    if castling != "-" and (
+        any(symbol not in "KQkq" for symbol in castling) or len(set(castling)) != len(castling)
+    ):
+        raise ValueError("Invalid FEN castling field.")
+    castling_rights = {
+        "wK": "K" in castling,
+        "wQ": "Q" in castling,
+        "bK": "k" in castling,
+        "bQ": "q" in castling,
+    }
+    for right, enabled in castling_rights.items():
+        if not enabled:
+            continue
+        home_row = 7 if right[0] == "w" else 0
+        rook_col = 7 if right[1] == "K" else 0
+        if board[home_row][4] != right[0] + "K" or board[home_row][rook_col] != right[0] + "R":
+            raise ValueError("Castling rights need the king and rook on their home squares.")
+
+    en_passant_target = None
+    if en_passant != "-":
+        row, col = convert_position(en_passant)
+        expected_row = 2 if turn == "w" else 5
+        pawn_row = row + 1 if turn == "w" else row - 1
+        origin_row = row - 1 if turn == "w" else row + 1
+        mover = "b" if turn == "w" else "w"
+        if (
+            row != expected_row
+            or board[row][col] != "."
+            or board[origin_row][col] != "."
+            or board[pawn_row][col] != mover + "P"
+        ):
+            raise ValueError("Invalid FEN en passant square.")
+        en_passant_target = (row, col)
+
+    try:
+        halfmove_clock = int(halfmove)
+        fullmove_number = int(fullmove)
+    except ValueError:
+        raise ValueError("FEN move clocks must be integers.") from None
+    if halfmove_clock < 0 or fullmove_number < 1:
+        raise ValueError("FEN move clocks are out of range.")
+
+    return {
+        "board": board,
+        "turn": turn,
+        "castling_rights": castling_rights,
+        "en_passant_target": en_passant_target,
+        "halfmove_clock": halfmove_clock,
+        "fullmove_number": fullmove_number,
+    }
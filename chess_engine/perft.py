@@ -0,0 +1,132 @@
+import argparse
+import sys
+import time
+
+from chess_engine.game import Game
+
+STANDARD_POSITIONS = (
+    (
+        "startpos",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        {1: 20, 2: 400, 3: 8902, 4: 197281},
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        {1: 48, 2: 2039, 3: 97862},
+    ),
+    (
+        "en_passant_endgame",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        {1: 14, 2: 191, 3: 2812, 4: 43238},
+    ),
+    (
+        "promotions",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        {1: 6, 2: 264, 3: 9467},
+    ),
+    (
+        "discovered_promotion",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        {1: 44, 2: 1486, 3: 62379},
+    ),
+    (
+        "middlegame",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        {1: 46, 2: 2079, 3: 89890},
+    ),
+)
+
+
+def perft(game, depth):
+    if depth == 0:
+        return 1
+
+    moves = game.get_legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move, promotion in moves:
+        game.commit_move(move, promotion)
+        nodes += perft(game, depth - 1)
+        game.undo_last_move()
+    return nodes
+
+
+def divide(game, depth):
+    results = {}
+    for move, promotion in game.get_legal_moves():
+        game.commit_move(move, promotion)
+        results[game.move_to_uci(move, promotion)] = perft(game, depth - 1) if depth > 1 else 1
+        game.undo_last_move()
+    return results
+
+
+def run_suite(max_depth=3, positions=STANDARD_POSITIONS):
+    results = []
+    for name, fen, expected_counts in positions:
+        for depth, expected in sorted(expected_counts.items()):
+            if depth > max_depth:
+                break
+            game = Game.from_fen(fen)
+            started = time.perf_counter()
+            nodes = perft(game, depth)
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "name": name,
+                    "depth": depth,
+                    "nodes": nodes,
+                    "expected": expected,
+                    "ok": nodes == expected,
+                    "seconds": elapsed,
+                    "nps": int(nodes / elapsed) if elapsed else 0,
+                }
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count move-generation leaf nodes.")
+    parser.add_argument("--fen", default=STANDARD_POSITIONS[0][1])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--divide", action="store_true", help="print counts per root move")
+    parser.add_argument("--suite", action="store_true", help="check the standard positions")
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        failures = 0
+        total_nodes = 0
+        total_seconds = 0.0
+        for result in run_suite(args.depth):
+            status = "ok" if result["ok"] else f"FAIL expected {result['expected']}"
+            print(
+                f"{result['name']:<22} depth {result['depth']} "
+                f"{result['nodes']:>9} nodes {result['nps']:>8} nps  {status}"
+            )
+            failures += not result["ok"]
+            total_nodes += result["nodes"]
+            total_seconds += result["seconds"]
+        if total_seconds:
+            print(f"total {total_nodes} nodes in {total_seconds:.2f}s ({int(total_nodes / total_seconds)} nps)")
+        return 1 if failures else 0
+
+    game = Game.from_fen(args.fen)
+    started = time.perf_counter()
+    if args.divide:
+        results = divide(game, args.depth)
+        for token in sorted(results):
+            print(f"{token}: {results[token]}")
+        nodes = sum(results.values())
+    else:
+        nodes = perft(game, args.depth)
+    elapsed = time.perf_counter() - started
+
+    print(f"nodes {nodes}")
+    print(f"time {elapsed:.3f}s ({int(nodes / elapsed) if elapsed else 0} nps)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
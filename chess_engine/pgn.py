@@ -0,0 +1,279 @@
+import re
+
+from chess_engine.game import Game
+
+STANDARD_START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+SEVEN_TAG_ROSTER = (
+    ("Event", "?"),
+    ("Site", "?"),
+    ("Date", "????.??.??"),
+    ("Round", "?"),
+    ("White", "?"),
+    ("Black", "?"),
+    ("Result", "*"),
+)
+LINE_WIDTH = 80
+
+_TAG = re.compile(r'^\s*\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+_TOKEN = re.compile(r"\s*([{}();]|\$\d+|[^\s{}();$]+)")
+_MOVE_NUMBER = re.compile(r"^\d+\.*")
+_SAN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+def _square(row, col):
+    return Game.coords_to_square(row, col)
+
+
+def result_token(outcome):
+    if not outcome["ended"]:
+        return "*"
+    if outcome["winner"] == "w":
+        return "1-0"
+    if outcome["winner"] == "b":
+        return "0-1"
+    return "1/2-1/2"
+
+
+def _candidate_moves(game, legal):
+    # Without a precomputed legal list, work from pseudo-legal moves and only
+    # pay for the king-safety check on the few that match the SAN.
+    if legal is not None:
+        return legal
+    return [(move, "Q" if move.promotion else None) for move in game.generate_pseudo_legal_moves()]
+
+
+def move_to_san(game, move, promotion=None, legal=None):
+    if move.special == "castle_kingside":
+        san = "O-O"
+    elif move.special == "castle_queenside":
+        san = "O-O-O"
+    else:
+        kind = move.piece[1]
+        target = _square(move.dr, move.dc)
+        if kind == "P":
+            san = f"{'abcdefgh'[move.sc]}x{target}" if move.is_capture else target
+            if move.promotion:
+                san += f"={promotion or 'Q'}"
+        else:
+            rivals = [
+                other
+                for other, _ in _candidate_moves(game, legal)
+                if other.piece == move.piece
+                and (other.dr, other.dc) == (move.dr, move.dc)
+                and (other.sr, other.sc) != (move.sr, move.sc)
+                and (legal is not None or not game.would_leave_king_in_check(other))
+            ]
+            origin = ""
+            if rivals:
+                start = _square(move.sr, move.sc)
+                if all(other.sc != move.sc for other in rivals):
+                    origin = start[0]
+                elif all(other.sr != move.sr for other in rivals):
+                    origin = start[1]
+                else:
+                    origin = start
+            san = f"{kind}{origin}{'x' if move.is_capture else ''}{target}"
+
+    record = game.make_move(move, promotion)
+    try:
+        if game.is_in_check(game.turn):
+            san += "+" if game.has_any_legal_moves(game.turn) else "#"
+    finally:
+        game.unmake_move(record)
+    return san
+
+
+def parse_san(game, san, legal=None):
+    token = (san or "").strip().rstrip("+#!?")
+    moves = _candidate_moves(game, legal)
+
+    castling = token.replace("0", "O")
+    if castling in {"O-O", "O-O-O"}:
+        special = "castle_kingside" if castling == "O-O" else "castle_queenside"
+        for move, promotion in moves:
+            if move.special == special and (
+                legal is not None or not game.would_leave_king_in_check(move)
+            ):
+                return move, promotion
+        raise ValueError(f"Illegal move: {san}")
+
+    match = _SAN.match(token)
+    if match is None:
+        raise ValueError(f"Invalid SAN: {san}")
+
+    kind, from_file, from_rank, _, target, promotion = match.groups()
+    kind = kind or "P"
+    dr, dc = 8 - int(target[1]), "abcdefgh".index(target[0])
+
+    candidates = []
+    for move, option in moves:
+        if move.piece[1] != kind or (move.dr, move.dc) != (dr, dc):
+            continue
+        if from_file and "abcdefgh"[move.sc] != from_file:
+            continue
+        if from_rank and str(8 - move.sr) != from_rank:
+            continue
+        if promotion and not move.promotion:
+            continue
+        if move.promotion:
+            if legal is None:
+                option = promotion or "Q"
+            elif option != (promotion or "Q"):
+                continue
+        if legal is None and game.would_leave_king_in_check(move, option or "Q"):
+            continue
+        candidates.append((move, option))
+
+    if not candidates:
+        raise ValueError(f"Illegal move: {san}")
+    if len(candidates) > 1:
+        raise ValueError(f"Ambiguous move: {san}")
+    return candidates[0]
+
+
+def _movetext_tokens(line, state):
+    pos = 0
+    while pos < len(line):
+        if state["in_comment"]:
+            end = line.find("}", pos)
+            if end < 0:
+                return
+            state["in_comment"] = False
+            pos = end + 1
+            continue
+
+        match = _TOKEN.match(line, pos)
+        if match is None:
+            return
+        token = match.group(1)
+        pos = match.end()
+        if token == "{":
+            state["in_comment"] = True
+        elif token == ";":
+            return
+        else:
+            yield token
+
+
+def _new_record():
+    return {"headers": {}, "moves": [], "result": "*"}
+
+
+def read_games(lines):
+    # Streams games one at a time from any iterable of lines (e.g. an open
+    # file), so memory stays bounded by the largest single game. Comments,
+    # variations and NAGs are skipped; moves come back as SAN strings.
+    record = _new_record()
+    state = {"in_comment": False, "variation_depth": 0, "in_movetext": False}
+
+    for line in lines:
+        if not state["in_comment"]:
+            if line.startswith("%"):
+                continue
+            tag = _TAG.match(line)
+            if tag:
+                if state["in_movetext"]:
+                    yield record
+                    record = _new_record()
+                    state.update(variation_depth=0, in_movetext=False)
+                value = re.sub(r"\\(.)", r"\1", tag.group(2))
+                record["headers"][tag.group(1)] = value
+                continue
+
+        for token in _movetext_tokens(line, state):
+            state["in_movetext"] = True
+            if token == "(":
+                state["variation_depth"] += 1
+            elif token == ")":
+                state["variation_depth"] = max(0, state["variation_depth"] - 1)
+            elif state["variation_depth"] or token.startswith("$"):
+                continue
+            elif token in RESULTS:
+                record["result"] = token
+                yield record
+                record = _new_record()
+                state.update(variation_depth=0, in_movetext=False)
+            else:
+                san = _MOVE_NUMBER.sub("", token)
+                if san:
+                    record["moves"].append(san)
+
+    if state["in_movetext"] or record["headers"]:
+        yield record
+
+
+def replay_game(record):
+    # Plays a read_games() record through the rules engine. Raises
+    # ValueError naming the first bad ply.
+    headers = record.get("headers", {})
+    fen = headers.get("FEN")
+    game = Game.from_fen(fen) if fen else Game()
+
+    for ply, san in enumerate(record.get("moves", []), start=1):
+        try:
+            move, promotion = parse_san(game, san)
+        except ValueError as exc:
+            raise ValueError(f"Ply {ply}: {exc}") from None
+        game.commit_move(move, promotion)
+    return game
+
+
+def game_to_san(game):
+    replay = Game.from_fen(game.start_fen)
+    moves = []
+    for move, promotion in game.move_history():
+        moves.append(move_to_san(replay, move, promotion))
+        replay.commit_move(move, promotion)
+    return moves
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def format_game(game, headers=None):
+    headers = dict(headers or {})
+    result = headers.get("Result") or result_token(game.get_outcome())
+    headers["Result"] = result
+    if game.start_fen != STANDARD_START_FEN:
+        headers.setdefault("SetUp", "1")
+        headers.setdefault("FEN", game.start_fen)
+
+    lines = []
+    for name, default in SEVEN_TAG_ROSTER:
+        lines.append(f'[{name} "{_escape(headers.pop(name, default))}"]')
+    for name, value in headers.items():
+        lines.append(f'[{name} "{_escape(value)}"]')
+    lines.append("")
+
+    fields = game.start_fen.split()
+    number = int(fields[5]) if len(fields) == 6 else 1
+    white_to_move = fields[1] == "w"
+
+    tokens = []
+    for index, san in enumerate(game_to_san(game)):
+        if white_to_move:
+            tokens.append(f"{number}.")
+        elif index == 0:
+            tokens.append(f"{number}...")
+        tokens.append(san)
+        if not white_to_move:
+            number += 1
+        white_to_move = not white_to_move
+    tokens.append(result)
+
+    current = ""
+    for token in tokens:
+        if current and len(current) + 1 + len(token) > LINE_WIDTH:
+            lines.append(current)
+            current = token
+        else:
+            current = f"{current} {token}" if current else token
+    lines.append(current)
+    return "\n".join(lines) + "\n"
+
+
+def write_game(stream, game, headers=None):
+    stream.write(format_game(game, headers))
+    stream.write("\n")
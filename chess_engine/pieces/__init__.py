@@ -1,8 +1,14 @@
+from .bishop import generate_targets as bishop_targets
 from .bishop import is_valid_move as bishop_move
+from .king import generate_targets as king_targets
 from .king import is_valid_move as king_move
+from .knight import generate_targets as knight_targets
 from .knight import is_valid_move as knight_move
+from .pawn import generate_targets as pawn_targets
 from .pawn import is_valid_move as pawn_move
+from .queen import generate_targets as queen_targets
 from .queen import is_valid_move as queen_move
+from .rook import generate_targets as rook_targets
 from .rook import is_valid_move as rook_move
 
 MOVE_VALIDATORS = {
@@ -13,3 +19,12 @@ MOVE_VALIDATORS = {
     "Q": queen_move,
     "K": king_move,
 }
+
+MOVE_GENERATORS = {
+    "P": pawn_targets,
+    "R": rook_targets,
+    "N": knight_targets,
+    "B": bishop_targets,
+    "Q": queen_targets,
+    "K": king_targets,
+}
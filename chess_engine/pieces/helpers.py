@@ -11,3 +11,36 @@ def clear_path(sr, sc, dr, dc, board):
         c += step_c
 
     return True
+
+
+def slide_targets(sr, sc, board, directions):
+    color = board[sr][sc][0]
+    targets = []
+
+    for step_r, step_c in directions:
+        r, c = sr + step_r, sc + step_c
+        while 0 <= r < 8 and 0 <= c < 8:
+            occupant = board[r][c]
+            if occupant != ".":
+                if occupant[0] != color:
+                    targets.append((r, c))
+                break
+            targets.append((r, c))
+            r += step_r
+            c += step_c
+
+    return targets
+
+
+def step_targets(sr, sc, board, offsets):
+    color = board[sr][sc][0]
+    targets = []
+
+    for step_r, step_c in offsets:
+        r, c = sr + step_r, sc + step_c
+        if 0 <= r < 8 and 0 <= c < 8:
+            occupant = board[r][c]
+            if occupant == "." or occupant[0] != color:
+                targets.append((r, c))
+
+    return targets
@@ -1,2 +1,11 @@
+from .helpers import step_targets
+
+OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
 def is_valid_move(_piece, sr, sc, dr, dc, _board):
     return max(abs(sr - dr), abs(sc - dc)) == 1
+
+
+def generate_targets(_piece, sr, sc, board):
+    return step_targets(sr, sc, board, OFFSETS)
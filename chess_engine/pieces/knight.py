@@ -1,2 +1,11 @@
+from .helpers import step_targets
+
+OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+
 def is_valid_move(_piece, sr, sc, dr, dc, _board):
     return (abs(sr - dr), abs(sc - dc)) in {(2, 1), (1, 2)}
+
+
+def generate_targets(_piece, sr, sc, board):
+    return step_targets(sr, sc, board, OFFSETS)
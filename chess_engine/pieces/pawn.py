@@ -24,3 +24,26 @@ def is_valid_move(piece, sr, sc, dr, dc, board):
 def is_attack_move(piece, sr, sc, dr, dc):
     direction = -1 if piece.startswith("w") else 1
     return dr == sr + direction and abs(dc - sc) == 1
+
+
+def generate_targets(piece, sr, sc, board):
+    direction = -1 if piece.startswith("w") else 1
+    start_row = 6 if piece.startswith("w") else 1
+    targets = []
+
+    dr = sr + direction
+    if not 0 <= dr < 8:
+        return targets
+
+    if board[dr][sc] == ".":
+        targets.append((dr, sc))
+        if sr == start_row and board[sr + (2 * direction)][sc] == ".":
+            targets.append((sr + (2 * direction), sc))
+
+    for dc in (sc - 1, sc + 1):
+        if 0 <= dc < 8:
+            target = board[dr][dc]
+            if target != "." and target[0] != piece[0]:
+                targets.append((dr, dc))
+
+    return targets
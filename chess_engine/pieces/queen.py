@@ -1,8 +1,17 @@
+from .bishop import DIRECTIONS as BISHOP_DIRECTIONS
 from .bishop import is_valid_move as bishop_move
+from .helpers import slide_targets
+from .rook import DIRECTIONS as ROOK_DIRECTIONS
 from .rook import is_valid_move as rook_move
 
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
 
 def is_valid_move(piece, sr, sc, dr, dc, board):
     return rook_move(piece, sr, sc, dr, dc, board) or bishop_move(
         piece, sr, sc, dr, dc, board
     )
+
+
+def generate_targets(_piece, sr, sc, board):
+    return slide_targets(sr, sc, board, DIRECTIONS)
@@ -1,4 +1,6 @@
-from .helpers import clear_path
+from .helpers import clear_path, slide_targets
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
 
 
 def is_valid_move(_piece, sr, sc, dr, dc, board):
@@ -6,3 +8,7 @@ def is_valid_move(_piece, sr, sc, dr, dc, board):
         return False
 
     return clear_path(sr, sc, dr, dc, board)
+
+
+def generate_targets(_piece, sr, sc, board):
+    return slide_targets(sr, sc, board, DIRECTIONS)
@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SHARD_COUNT = 16
+DEFAULT_MAX_GAMES = 10000
+DEFAULT_IDLE_TTL_SECONDS = 3600
+DEFAULT_SWEEP_INTERVAL_SECONDS = 60
+
+
+def _env_number(name, default):
+    try:
+        return max(0, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class GameEntry:
+    # The lock serializes every read-modify-write on this one game; `game` is
+    # swapped in place on reset so holders of the entry keep the same lock.
+    __slots__ = ("game", "lock", "last_access")
+
+    def __init__(self, game):
+        self.game = game
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+
+
+class GameRegistry:
+    # Games are spread over independently locked shards, so lookups for
+    # different games never wait on each other. Each shard is kept in LRU
+    # order, so the least recently used game overall is the oldest of the
+    # shard heads; it is evicted once the total passes `max_games`. Games idle
+    # for longer than `idle_ttl` seconds are dropped by sweep(). A zero limit
+    # disables it.
+    def __init__(
+        self,
+        shard_count=DEFAULT_SHARD_COUNT,
+        max_games=None,
+        idle_ttl=None,
+        on_evict=None,
+    ):
+        if max_games is None:
+            max_games = int(_env_number("CHESS_MAX_GAMES", DEFAULT_MAX_GAMES))
+        if idle_ttl is None:
+            idle_ttl = _env_number("CHESS_GAME_TTL_SECONDS", DEFAULT_IDLE_TTL_SECONDS)
+
+        shard_count = max(1, shard_count)
+        self._shards = [(OrderedDict(), threading.Lock()) for _ in range(shard_count)]
+        self.max_games = max_games
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self._count = 0
+        self._count_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.created_total = 0
+        self.evicted = {"idle": 0, "capacity": 0}
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+
+    def _shard(self, game_id):
+        return self._shards[hash(game_id) % len(self._shards)]
+
+    def _record_evictions(self, reason, evicted):
+        if not evicted:
+            return
+        with self._metrics_lock:
+            self.evicted[reason] += len(evicted)
+        if self.on_evict is not None:
+            for game_id, entry in evicted:
+                self.on_evict(game_id, entry, reason)
+
+    def _adjust_count(self, delta):
+        with self._count_lock:
+            self._count += delta
+
+    def _claim_eviction(self):
+        # Reserves one eviction so concurrent adds never evict more games than
+        # the total is over the limit.
+        with self._count_lock:
+            if self._count <= self.max_games:
+                return False
+            self._count -= 1
+            return True
+
+    def _evict_oldest(self):
+        oldest = None
+        for entries, lock in self._shards:
+            with lock:
+                if entries:
+                    head = next(iter(entries.values()))
+                    if oldest is None or head.last_access < oldest[0]:
+                        oldest = (head.last_access, entries, lock)
+        if oldest is not None:
+            _, entries, lock = oldest
+            with lock:
+                if entries:
+                    return entries.popitem(last=False)
+        return None
+
+    def get(self, game_id):
+        entries, lock = self._shard(game_id)
+        with lock:
+            entry = entries.get(game_id)
+            if entry is not None:
+                entries.move_to_end(game_id)
+                entry.last_access = time.monotonic()
+            return entry
+
+    def add(self, game_id, game, replace=True, created=True):
+        # `created` is False for games reloaded from a store, which are not
+        # counted in created_total.
+        entry = GameEntry(game)
+        entries, lock = self._shard(game_id)
+        evicted = []
+        with lock:
+            existing = entries.get(game_id)
+            if existing is not None and not replace:
+                entries.move_to_end(game_id)
+                existing.last_access = time.monotonic()
+                return existing
+            entries[game_id] = entry
+            entries.move_to_end(game_id)
+            if existing is None:
+                self._adjust_count(1)
+
+        while self.max_games and self._claim_eviction():
+            oldest = self._evict_oldest()
+            if oldest is None:
+                self._adjust_count(1)
+                break
+            evicted.append(oldest)
+
+        if created:
+            with self._metrics_lock:
+                self.created_total += 1
+        self._record_evictions("capacity", evicted)
+        return entry
+
+    def remove(self, game_id):
+        entries, lock = self._shard(game_id)
+        with lock:
+            entry = entries.pop(game_id, None)
+            if entry is not None:
+                self._adjust_count(-1)
+            return entry
+
+    def sweep(self, now=None):
+        if not self.idle_ttl:
+            return 0
+
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_ttl
+        evicted = []
+        for entries, lock in self._shards:
+            with lock:
+                # LRU order means the idle games sit at the front.
+                while entries:
+                    game_id, entry = next(iter(entries.items()))
+                    if entry.last_access > cutoff:
+                        break
+                    del entries[game_id]
+                    evicted.append((game_id, entry))
+                    self._adjust_count(-1)
+
+        self._record_evictions("idle", evicted)
+        return len(evicted)
+
+    def start_sweeper(self, interval=None):
+        if interval is None:
+            interval = _env_number("CHESS_SWEEP_INTERVAL_SECONDS", DEFAULT_SWEEP_INTERVAL_SECONDS)
+        if self._sweeper is not None or not interval or not self.idle_ttl:
+            return
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=run, name="game-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+
+    def metrics(self):
+        with self._metrics_lock:
+            evicted = dict(self.evicted)
+            created = self.created_total
+        return {
+            "live": len(self),
+            "created_total": created,
+            "evicted_total": sum(evicted.values()),
+            "evicted": evicted,
+            "max_games": self.max_games,
+            "idle_ttl_seconds": self.idle_ttl,
+        }
+
+    def __len__(self):
+        total = 0
+        for entries, lock in self._shards:
+            with lock:
+                total += len(entries)
+        return total
@@ -0,0 +1,161 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from chess_engine.game import Game
+from chess_engine.pgn import parse_san, read_games, result_token
+
+DEFAULT_BATCH_SIZE = 64
+
+
+def validate_record(index, record):
+    headers = record.get("headers", {})
+    result = {
+        "index": index,
+        "event": headers.get("Event"),
+        "white": headers.get("White"),
+        "black": headers.get("Black"),
+        "declared_result": record.get("result", "*"),
+        "status": "ok",
+        "error": None,
+        "plies": 0,
+    }
+
+    try:
+        fen = headers.get("FEN")
+        game = Game.from_fen(fen) if fen else Game()
+    except ValueError as exc:
+        result.update(status="invalid_setup", error=str(exc))
+        return result
+
+    # Only endings that need no claim stop a replay; archived games often
+    # play on past a threefold or fifty-move position. A full get_outcome()
+    # per ply would also double the cost, so mate and stalemate surface as a
+    # failed parse and insufficient material is rechecked only after
+    # captures and promotions.
+    material_changed = False
+    for san in record.get("moves", []):
+        ply = result["plies"] + 1
+        ended = (
+            game.is_seventy_five_move_draw()
+            or game.is_fivefold_repetition()
+            or (material_changed and game.is_insufficient_material())
+        )
+        if not ended:
+            try:
+                move, promotion = parse_san(game, san)
+            except ValueError as exc:
+                ended = not game.has_any_legal_moves(game.turn)
+                if not ended:
+                    result.update(status="illegal", error=f"Ply {ply}: {exc}")
+                    break
+        if ended:
+            result.update(status="moves_after_end", error=f"Ply {ply}: {san}")
+            break
+        material_changed = move.is_capture or bool(move.promotion)
+        game.commit_move(move, promotion)
+        result["plies"] += 1
+
+    outcome = game.get_outcome()
+    claimable = []
+    if game.is_threefold_repetition():
+        claimable.append("threefold_repetition")
+    if game.is_fifty_move_draw():
+        claimable.append("fifty_move_rule")
+
+    result.update(
+        termination=outcome["result"],
+        result=result_token(outcome),
+        claimable_draws=claimable,
+        final_fen=game.to_fen(),
+    )
+    return result
+
+
+def _validate_batch(batch):
+    return [validate_record(index, record) for index, record in batch]
+
+
+def _batches(records, batch_size):
+    batch = []
+    for index, record in enumerate(records):
+        batch.append((index, record))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_validation(lines, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    # Results are yielded in input order. The parent only parses PGN; replay
+    # runs in worker processes, and at most two batches per worker are in
+    # flight so memory stays bounded on arbitrarily large inputs.
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    batches = _batches(read_games(lines), max(1, int(batch_size)))
+
+    if workers == 1:
+        for batch in batches:
+            yield from _validate_batch(batch)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(_validate_batch, batch))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def validate_file(input_path, output_path, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    stats = {"games": 0, "ok": 0, "failed": 0, "plies": 0}
+    started = time.perf_counter()
+
+    with open(input_path, encoding="utf-8", errors="replace") as source, open(
+        output_path, "w", encoding="utf-8"
+    ) as sink:
+        for result in iter_validation(source, workers, batch_size):
+            sink.write(json.dumps(result) + "\n")
+            stats["games"] += 1
+            stats["plies"] += result["plies"]
+            if result["status"] == "ok":
+                stats["ok"] += 1
+            else:
+                stats["failed"] += 1
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = elapsed
+    stats["games_per_second"] = stats["games"] / elapsed if elapsed else 0.0
+    stats["plies_per_second"] = stats["plies"] / elapsed if elapsed else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay and validate every game in a PGN file.")
+    parser.add_argument("input", help="PGN file to validate")
+    parser.add_argument("-o", "--output", required=True, help="JSON-lines file for per-game results")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    stats = validate_file(args.input, args.output, args.workers, args.batch_size)
+    print(
+        f"{stats['games']} games ({stats['ok']} ok, {stats['failed']} failed), "
+        f"{stats['plies']} plies in {stats['seconds']:.2f}s "
+        f"({stats['games_per_second']:.1f} games/s, {int(stats['plies_per_second'])} plies/s)"
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,6 @@
 # - draws.py
 # - en_passant.py
 # - move_application.py
+# - move_generation.py
 # - promotion.py
+# - zobrist.py
@@ -1,17 +1,77 @@
-def is_square_attacked(board, row, col, attacker_color, move_validators, pawn_attack_move):
-    for src_row in range(8):
-        for src_col in range(8):
-            piece = board[src_row][src_col]
-            if piece == "." or piece[0] != attacker_color:
-                continue
-
-            if piece[1] == "P":
-                if pawn_attack_move(piece, src_row, src_col, row, col):
-                    return True
-                continue
-
-            validator = move_validators.get(piece[1])
-            if validator and validator(piece, src_row, src_col, row, col, board):
-                return True
+from chess_engine.pieces.bishop import DIRECTIONS as DIAGONAL_DIRECTIONS
+from chess_engine.pieces.king import OFFSETS as KING_OFFSETS
+from chess_engine.pieces.knight import OFFSETS as KNIGHT_OFFSETS
+from chess_engine.pieces.rook import DIRECTIONS as STRAIGHT_DIRECTIONS
+
+
+def _first_piece_on_ray(board, row, col, step_r, step_c):
+    r, c = row + step_r, col + step_c
+    while 0 <= r < 8 and 0 <= c < 8:
+        piece = board[r][c]
+        if piece != ".":
+            return piece
+        r += step_r
+        c += step_c
+    return None
+
+
+def is_square_attacked(board, row, col, attacker_color):
+    # Cast outward from the target square instead of asking every enemy
+    # piece whether it can reach it.
+    pawn = attacker_color + "P"
+    pawn_row = row + (1 if attacker_color == "w" else -1)
+    if 0 <= pawn_row < 8:
+        if col > 0 and board[pawn_row][col - 1] == pawn:
+            return True
+        if col < 7 and board[pawn_row][col + 1] == pawn:
+            return True
+
+    knight = attacker_color + "N"
+    for step_r, step_c in KNIGHT_OFFSETS:
+        r, c = row + step_r, col + step_c
+        if 0 <= r < 8 and 0 <= c < 8 and board[r][c] == knight:
+            return True
+
+    king = attacker_color + "K"
+    for step_r, step_c in KING_OFFSETS:
+        r, c = row + step_r, col + step_c
+        if 0 <= r < 8 and 0 <= c < 8 and board[r][c] == king:
+            return True
+
+    straight = {attacker_color + "R", attacker_color + "Q"}
+    for step_r, step_c in STRAIGHT_DIRECTIONS:
+        if _first_piece_on_ray(board, row, col, step_r, step_c) in straight:
+            return True
+
+    diagonal = {attacker_color + "B", attacker_color + "Q"}
+    for step_r, step_c in DIAGONAL_DIRECTIONS:
+        if _first_piece_on_ray(board, row, col, step_r, step_c) in diagonal:
+            return True
 
     return False
+
+
+def pinned_squares(board, row, col, color):
+    # Squares of `color` pieces that are the only blocker between the king on
+    # (row, col) and an enemy slider moving along that line.
+    enemy = "b" if color == "w" else "w"
+    pinned = set()
+    for directions, sliders in (
+        (STRAIGHT_DIRECTIONS, {enemy + "R", enemy + "Q"}),
+        (DIAGONAL_DIRECTIONS, {enemy + "B", enemy + "Q"}),
+    ):
+        for step_r, step_c in directions:
+            shield = None
+            r, c = row + step_r, col + step_c
+            while 0 <= r < 8 and 0 <= c < 8:
+                piece = board[r][c]
+                if piece != ".":
+                    if shield is None and piece[0] == color:
+                        shield = (r, c)
+                    else:
+                        if shield is not None and piece in sliders:
+                            pinned.add(shield)
+                        break
+                r += step_r
+                c += step_c
+    return pinned
@@ -48,3 +48,37 @@ def get_castling_move_type(
         return "castle_queenside"
 
     return None
+
+
+def get_castling_targets(
+    piece,
+    sr,
+    sc,
+    board,
+    castling_rights,
+    is_in_check,
+    is_square_attacked,
+    opponent_color,
+):
+    color = piece[0]
+    if not castling_rights[color + "K"] and not castling_rights[color + "Q"]:
+        return []
+
+    targets = []
+    for dc in (6, 2):
+        castle_type = get_castling_move_type(
+            piece,
+            sr,
+            sc,
+            sr,
+            dc,
+            board,
+            castling_rights,
+            is_in_check,
+            is_square_attacked,
+            opponent_color,
+        )
+        if castle_type is not None:
+            targets.append((dc, castle_type))
+
+    return targets
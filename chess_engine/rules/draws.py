@@ -1,16 +1,10 @@
 from chess_engine.rules.en_passant import get_effective_en_passant_target
+from chess_engine.rules.zobrist import compute_hash
 
 
 def build_position_key(board, turn, castling_rights, en_passant_target):
-    board_key = tuple(tuple(row) for row in board)
-    castling_key = (
-        castling_rights["wK"],
-        castling_rights["wQ"],
-        castling_rights["bK"],
-        castling_rights["bQ"],
-    )
     effective_ep = get_effective_en_passant_target(board, en_passant_target, turn)
-    return board_key, turn, castling_key, effective_ep
+    return compute_hash(board, turn, castling_rights, effective_ep)
 
 
 def is_insufficient_material(board):
@@ -12,6 +12,16 @@ def is_en_passant_capture(piece, sr, sc, dr, dc, board, en_passant_target, oppon
     return board[sr][dc] == opponent_color + "P"
 
 
+def en_passant_targets(piece, sr, sc, board, en_passant_target, opponent_color):
+    if en_passant_target is None:
+        return []
+
+    dr, dc = en_passant_target
+    if is_en_passant_capture(piece, sr, sc, dr, dc, board, en_passant_target, opponent_color):
+        return [(dr, dc)]
+    return []
+
+
 def next_en_passant_target(move):
     if move.piece[1] == "P" and abs(move.dr - move.sr) == 2:
         return ((move.dr + move.sr) // 2, move.sc)
@@ -2,15 +2,21 @@ from chess_engine.constants import PROMOTION_OPTIONS
 
 
 def apply_move_to_board(board, move, promotion_piece):
+    changes = [(move.sr, move.sc, board[move.sr][move.sc])]
     board[move.sr][move.sc] = "."
 
     if move.special == "en_passant":
         cap_row, cap_col = move.capture_square
+        changes.append((cap_row, cap_col, board[cap_row][cap_col]))
         board[cap_row][cap_col] = "."
     elif move.special == "castle_kingside":
+        changes.append((move.sr, 5, board[move.sr][5]))
+        changes.append((move.sr, 7, board[move.sr][7]))
         board[move.sr][5] = board[move.sr][7]
         board[move.sr][7] = "."
     elif move.special == "castle_queenside":
+        changes.append((move.sr, 3, board[move.sr][3]))
+        changes.append((move.sr, 0, board[move.sr][0]))
         board[move.sr][3] = board[move.sr][0]
         board[move.sr][0] = "."
 
@@ -21,7 +27,14 @@ def apply_move_to_board(board, move, promotion_piece):
             choice = "Q"
         final_piece = move.piece[0] + choice
 
+    changes.append((move.dr, move.dc, board[move.dr][move.dc]))
     board[move.dr][move.dc] = final_piece
+    return changes
+
+
+def revert_board_changes(board, changes):
+    for row, col, previous in reversed(changes):
+        board[row][col] = previous
 
 
 def update_castling_rights(castling_rights, move):
@@ -0,0 +1,180 @@
+from chess_engine.models import Move
+from chess_engine.pieces import MOVE_GENERATORS
+from chess_engine.pieces.bishop import DIRECTIONS as BISHOP_DIRECTIONS
+from chess_engine.pieces.king import OFFSETS as KING_OFFSETS
+from chess_engine.pieces.knight import OFFSETS as KNIGHT_OFFSETS
+from chess_engine.pieces.queen import DIRECTIONS as QUEEN_DIRECTIONS
+from chess_engine.pieces.rook import DIRECTIONS as ROOK_DIRECTIONS
+from chess_engine.rules.castling import get_castling_targets
+from chess_engine.rules.en_passant import en_passant_targets
+from chess_engine.rules.promotion import needs_promotion
+
+_STEP_OFFSETS = {"N": KNIGHT_OFFSETS, "K": KING_OFFSETS}
+_SLIDE_DIRECTIONS = {"B": BISHOP_DIRECTIONS, "R": ROOK_DIRECTIONS, "Q": QUEEN_DIRECTIONS}
+
+
+def generate_pseudo_legal_moves(
+    board,
+    color,
+    castling_rights,
+    en_passant_target,
+    is_in_check,
+    is_square_attacked,
+):
+    opponent_color = "b" if color == "w" else "w"
+    moves = []
+
+    for sr in range(8):
+        for sc in range(8):
+            piece = board[sr][sc]
+            if piece == "." or piece[0] != color:
+                continue
+
+            piece_type = piece[1]
+            for dr, dc in MOVE_GENERATORS[piece_type](piece, sr, sc, board):
+                target = board[dr][dc]
+                if target == ".":
+                    moves.append(
+                        Move(
+                            sr=sr,
+                            sc=sc,
+                            dr=dr,
+                            dc=dc,
+                            piece=piece,
+                            promotion=piece_type == "P" and needs_promotion(piece, dr),
+                        )
+                    )
+                elif target[1] != "K":
+                    moves.append(
+                        Move(
+                            sr=sr,
+                            sc=sc,
+                            dr=dr,
+                            dc=dc,
+                            piece=piece,
+                            target=target,
+                            promotion=piece_type == "P" and needs_promotion(piece, dr),
+                            is_capture=True,
+                            capture_square=(dr, dc),
+                        )
+                    )
+
+            if piece_type == "P":
+                for dr, dc in en_passant_targets(
+                    piece, sr, sc, board, en_passant_target, opponent_color
+                ):
+                    moves.append(
+                        Move(
+                            sr=sr,
+                            sc=sc,
+                            dr=dr,
+                            dc=dc,
+                            piece=piece,
+                            target=opponent_color + "P",
+                            special="en_passant",
+                            is_capture=True,
+                            capture_square=(sr, dc),
+                        )
+                    )
+            elif piece_type == "K":
+                for dc, castle_type in get_castling_targets(
+                    piece,
+                    sr,
+                    sc,
+                    board,
+                    castling_rights,
+                    is_in_check,
+                    is_square_attacked,
+                    opponent_color,
+                ):
+                    moves.append(
+                        Move(sr=sr, sc=sc, dr=sr, dc=dc, piece=piece, special=castle_type)
+                    )
+
+    return moves
+
+
+def generate_pseudo_legal_captures(board, color, en_passant_target):
+    # Captures and promotions only, for the quiescence search. Castling and
+    # quiet moves are never generated.
+    opponent_color = "b" if color == "w" else "w"
+    moves = []
+
+    for sr in range(8):
+        for sc in range(8):
+            piece = board[sr][sc]
+            if piece == "." or piece[0] != color:
+                continue
+
+            piece_type = piece[1]
+            if piece_type == "P":
+                dr = sr + (-1 if color == "w" else 1)
+                if not 0 <= dr < 8:
+                    continue
+                targets = [
+                    (dr, dc)
+                    for dc in (sc - 1, sc + 1)
+                    if 0 <= dc < 8 and board[dr][dc][0] == opponent_color
+                ]
+                if board[dr][sc] == "." and needs_promotion(piece, dr):
+                    targets.append((dr, sc))
+            elif piece_type in _STEP_OFFSETS:
+                targets = [
+                    (sr + step_r, sc + step_c)
+                    for step_r, step_c in _STEP_OFFSETS[piece_type]
+                    if 0 <= sr + step_r < 8
+                    and 0 <= sc + step_c < 8
+                    and board[sr + step_r][sc + step_c][0] == opponent_color
+                ]
+            else:
+                # Sliders only need the first occupied square on each ray.
+                targets = []
+                for step_r, step_c in _SLIDE_DIRECTIONS[piece_type]:
+                    r, c = sr + step_r, sc + step_c
+                    while 0 <= r < 8 and 0 <= c < 8:
+                        occupant = board[r][c]
+                        if occupant != ".":
+                            if occupant[0] == opponent_color:
+                                targets.append((r, c))
+                            break
+                        r += step_r
+                        c += step_c
+
+            for dr, dc in targets:
+                target = board[dr][dc]
+                if target == ".":
+                    moves.append(Move(sr=sr, sc=sc, dr=dr, dc=dc, piece=piece, promotion=True))
+                elif target[1] != "K":
+                    moves.append(
+                        Move(
+                            sr=sr,
+                            sc=sc,
+                            dr=dr,
+                            dc=dc,
+                            piece=piece,
+                            target=target,
+                            promotion=piece_type == "P" and needs_promotion(piece, dr),
+                            is_capture=True,
+                            capture_square=(dr, dc),
+                        )
+                    )
+
+            if piece_type == "P":
+                for dr, dc in en_passant_targets(
+                    piece, sr, sc, board, en_passant_target, opponent_color
+                ):
+                    moves.append(
+                        Move(
+                            sr=sr,
+                            sc=sc,
+                            dr=dr,
+                            dc=dc,
+                            piece=piece,
+                            target=opponent_color + "P",
+                            special="en_passant",
+                            is_capture=True,
+                            capture_square=(sr, dc),
+                        )
+                    )
+
+    return moves
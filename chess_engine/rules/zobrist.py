@@ -0,0 +1,48 @@
+import random
+
+from chess_engine.board_state import PIECE_CODES
+
+# A fixed seed keeps keys identical across processes and restarts, so hashes
+# can be stored or shared between workers.
+_rng = random.Random(0x5A0B12C7)
+
+PIECE_KEYS = {piece: tuple(_rng.getrandbits(64) for _ in range(64)) for piece in PIECE_CODES}
+PIECE_KEYS["."] = (0,) * 64
+SIDE_TO_MOVE_KEY = _rng.getrandbits(64)
+CASTLING_KEYS = {right: _rng.getrandbits(64) for right in ("wK", "wQ", "bK", "bQ")}
+EN_PASSANT_FILE_KEYS = tuple(_rng.getrandbits(64) for _ in range(8))
+
+
+def castling_key(castling_rights):
+    key = 0
+    for right, enabled in castling_rights.items():
+        if enabled:
+            key ^= CASTLING_KEYS[right]
+    return key
+
+
+def en_passant_key(effective_en_passant_target):
+    if effective_en_passant_target is None:
+        return 0
+    return EN_PASSANT_FILE_KEYS[effective_en_passant_target[1]]
+
+
+def compute_hash(board, turn, castling_rights, effective_en_passant_target):
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != ".":
+                key ^= PIECE_KEYS[piece][row * 8 + col]
+
+    if turn == "b":
+        key ^= SIDE_TO_MOVE_KEY
+
+    return key ^ castling_key(castling_rights) ^ en_passant_key(effective_en_passant_target)
+
+
+def update_hash(key, board, changes):
+    for row, col, previous in changes:
+        square = row * 8 + col
+        key ^= PIECE_KEYS[previous][square] ^ PIECE_KEYS[board[row][col]][square]
+    return key
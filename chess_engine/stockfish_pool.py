@@ -0,0 +1,145 @@
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = 2
+MAX_POOL_SIZE = 32
+
+
+def _configured_pool_size(size=None):
+    if size is None:
+        size = os.getenv("STOCKFISH_POOL_SIZE", DEFAULT_POOL_SIZE)
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        size = DEFAULT_POOL_SIZE
+    return max(1, min(MAX_POOL_SIZE, size))
+
+
+class StockfishPool:
+    # Long-lived UCI processes handed out one request at a time. Engines are
+    # spawned lazily up to `size`; a lease that raises or finds its process
+    # gone discards that engine so the next lease spawns a replacement.
+    def __init__(self, command=None, size=None, lease_timeout=5.0):
+        self.command = command or os.getenv("STOCKFISH_PATH", "stockfish")
+        self.size = _configured_pool_size(size)
+        self.lease_timeout = lease_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.spawned = 0
+        self.restarts = 0
+
+    def _spawn(self):
+        import chess.engine
+
+        engine = chess.engine.SimpleEngine.popen_uci(self.command)
+        with self._lock:
+            self.spawned += 1
+        return engine
+
+    @staticmethod
+    def _is_alive(engine):
+        return not engine.returncode.done()
+
+    def _discard(self, engine):
+        with self._lock:
+            self._created -= 1
+        try:
+            engine.quit()
+        except Exception:
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+    def _acquire(self, timeout):
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except queue.Empty:
+                engine = None
+
+            if engine is None:
+                with self._lock:
+                    if self._closed:
+                        raise RuntimeError("Stockfish pool is closed.")
+                    can_spawn = self._created < self.size
+                    if can_spawn:
+                        self._created += 1
+
+                if can_spawn:
+                    try:
+                        return self._spawn()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+
+                engine = self._idle.get(timeout=timeout)
+
+            if self._is_alive(engine):
+                return engine
+
+            with self._lock:
+                self.restarts += 1
+            self._discard(engine)
+
+    def _release(self, engine, healthy):
+        alive = self._is_alive(engine)
+        if healthy and alive and not self._closed:
+            self._idle.put(engine)
+            return
+        if not healthy or not alive:
+            with self._lock:
+                self.restarts += 1
+        self._discard(engine)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        engine = self._acquire(self.lease_timeout if timeout is None else timeout)
+        healthy = True
+        try:
+            yield engine
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self._release(engine, healthy)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "live": self._created,
+                "idle": self._idle.qsize(),
+                "spawned": self.spawned,
+                "restarts": self.restarts,
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(engine)
+
+
+_pool_lock = threading.Lock()
+_pool = None
+
+
+def get_stockfish_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = StockfishPool()
+            atexit.register(_pool.close)
+        return _pool
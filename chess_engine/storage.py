@@ -0,0 +1,265 @@
+import abc
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from chess_engine.game import Game
+from chess_engine.models import decode_move, encode_move
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL_MS = 200
+
+_MISSING = object()
+
+
+def pack_moves(game):
+    # Two bytes per move, using the 16-bit packed move encoding.
+    packed = bytearray()
+    for move, promotion in game.move_history():
+        packed += encode_move(move, promotion).to_bytes(2, "little")
+    return bytes(packed)
+
+
+def unpack_moves(packed):
+    return [
+        int.from_bytes(packed[offset:offset + 2], "little")
+        for offset in range(0, len(packed), 2)
+    ]
+
+
+def encode_game(game):
+    return game.start_fen, pack_moves(game)
+
+
+def decode_game(start_fen, packed):
+    game = Game.from_fen(start_fen)
+    for value in unpack_moves(packed):
+        move, promotion = decode_move(value, game.board)
+        token = game.move_to_uci(move, promotion)
+        if not game.apply_uci_move(token):
+            raise ValueError(f"Stored move {token} is illegal.")
+    return game
+
+
+class GameStore(abc.ABC):
+    # save() returns False when the store already holds a newer version of
+    # the game, i.e. the caller's copy is stale and must be reloaded.
+    @abc.abstractmethod
+    def save(self, game_id, game):
+        pass
+
+    @abc.abstractmethod
+    def load(self, game_id):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, game_id):
+        pass
+
+    @abc.abstractmethod
+    def version(self, game_id):
+        # The stored version of the game, or None if it is not stored.
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class SQLiteGameStore(GameStore):
+    # With a zero `flush_interval_ms` every save is written through before it
+    # returns. Otherwise saves are coalesced per game in memory and written in
+    # one transaction when `batch_size` games are pending or every
+    # `flush_interval_ms`; loads see pending writes first, so a worker always
+    # reads its own saves. Rows carry the game version and a write only lands
+    # if it is newer than the stored one, so a worker holding a stale copy
+    # cannot overwrite moves another worker already committed. A batched
+    # write rejected at flush time is reported through `on_stale`; only write
+    # through keeps that from happening when several workers share the file.
+    def __init__(
+        self,
+        path,
+        batch_size=DEFAULT_BATCH_SIZE,
+        flush_interval_ms=DEFAULT_FLUSH_INTERVAL_MS,
+        on_stale=None,
+    ):
+        self.path = path
+        self.on_stale = on_stale
+        self.batch_size = max(1, int(batch_size))
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "game_id TEXT PRIMARY KEY, "
+            "start_fen TEXT NOT NULL, "
+            "moves BLOB NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(games)")}
+        if "version" not in columns:
+            self._connection.execute(
+                "ALTER TABLE games ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+        self._connection.commit()
+        self._db_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._stale = set()
+        self._stop = threading.Event()
+        self._flusher = None
+        self.write_through = flush_interval_ms <= 0
+        if not self.write_through:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                args=(flush_interval_ms / 1000.0,),
+                name="game-store-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _flush_periodically(self, interval):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def save(self, game_id, game):
+        record = encode_game(game) + (game.version,)
+        if self.write_through:
+            with self._flush_lock:
+                return not self._write({game_id: record})
+
+        with self._pending_lock:
+            # A batched write that lost to a newer version is reported here.
+            if game_id in self._stale:
+                self._stale.discard(game_id)
+                return False
+            self._pending[game_id] = record
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+        return True
+
+    def delete(self, game_id):
+        if self.write_through:
+            with self._flush_lock:
+                self._write({game_id: None})
+            return
+        with self._pending_lock:
+            self._pending[game_id] = None
+
+    def load(self, game_id):
+        with self._pending_lock:
+            self._stale.discard(game_id)
+            record = self._pending.get(game_id, _MISSING)
+        if record is _MISSING:
+            with self._db_lock:
+                record = self._connection.execute(
+                    "SELECT start_fen, moves, version FROM games WHERE game_id = ?",
+                    (game_id,),
+                ).fetchone()
+        if record is None:
+            return None
+
+        start_fen, packed, version = record
+        game = decode_game(start_fen, packed)
+        game.version = version
+        return game
+
+    def version(self, game_id):
+        with self._pending_lock:
+            record = self._pending.get(game_id, _MISSING)
+        if record is not _MISSING:
+            return record[2] if record is not None else None
+        with self._db_lock:
+            row = self._connection.execute(
+                "SELECT version FROM games WHERE game_id = ?",
+                (game_id,),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def flush(self):
+        # Flushes run one at a time and leave records pending until they are
+        # written, so loads never miss a save that is mid-flush.
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = dict(self._pending)
+            if not pending:
+                return 0
+
+            stale = self._write(pending)
+
+            with self._pending_lock:
+                self._stale.update(stale)
+                for game_id, record in pending.items():
+                    if self._pending.get(game_id, _MISSING) is record:
+                        del self._pending[game_id]
+
+        if self.on_stale is not None:
+            for game_id in stale:
+                self.on_stale(game_id)
+        return len(pending)
+
+    def _write(self, pending):
+        # Returns the ids whose write was rejected because the stored version
+        # is already as new or newer.
+        now = time.time()
+        stale = []
+        with self._db_lock:
+            with self._connection:
+                for game_id, record in pending.items():
+                    if record is None:
+                        self._connection.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+                        continue
+                    start_fen, packed, version = record
+                    cursor = self._connection.execute(
+                        "INSERT INTO games (game_id, start_fen, moves, updated_at, version) "
+                        "VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT(game_id) DO UPDATE SET "
+                        "start_fen = excluded.start_fen, "
+                        "moves = excluded.moves, "
+                        "updated_at = excluded.updated_at, "
+                        "version = excluded.version "
+                        "WHERE games.version < excluded.version",
+                        (game_id, start_fen, packed, now, version),
+                    )
+                    if cursor.rowcount == 0:
+                        stale.append(game_id)
+        return stale
+
+    def close(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        with self._db_lock:
+            self._connection.close()
+
+
+def open_store_from_env(on_stale=None):
+    path = os.getenv("CHESS_DB_PATH")
+    if not path:
+        return None
+
+    try:
+        batch_size = int(os.getenv("CHESS_DB_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+    except ValueError:
+        batch_size = DEFAULT_BATCH_SIZE
+    try:
+        flush_interval_ms = int(os.getenv("CHESS_DB_FLUSH_MS", DEFAULT_FLUSH_INTERVAL_MS))
+    except ValueError:
+        flush_interval_ms = DEFAULT_FLUSH_INTERVAL_MS
+
+    store = SQLiteGameStore(
+        path,
+        batch_size=batch_size,
+        flush_interval_ms=flush_interval_ms,
+        on_stale=on_stale,
+    )
+    atexit.register(store.close)
+    return store
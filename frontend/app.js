@@ -41,6 +41,12 @@ let orientation = "white";
 let moveHistory = [];
 let selectionRequestId = 0;
 let engineBusy = false;
+let eventSource = null;
+
+const clientId =
+  window.crypto && window.crypto.randomUUID
+    ? window.crypto.randomUUID()
+    : `client-${Math.random().toString(36).slice(2)}`;
 
 function squareName(row, col) {
   return `${files[col]}${8 - row}`;
@@ -190,14 +196,16 @@ async function fetchLegalTargets(startSquare) {
     return [];
   }
 
-  try {
-    const response = await api(
-      `/api/games/${gameId}/legal-moves?from=${encodeURIComponent(startSquare)}`
-    );
-    return response.targets || [];
-  } catch {
-    return [];
+  if (!gameState.legal_moves) {
+    try {
+      const response = await api(`/api/games/${gameId}/legal-moves`);
+      gameState.legal_moves = response.moves || {};
+    } catch {
+      return [];
+    }
   }
+
+  return (gameState.legal_moves[startSquare] || []).map((target) => target.to);
 }
 
 function renderBoard() {
@@ -308,7 +316,7 @@ function updateControls() {
 
 async function api(path, options = {}) {
   const response = await fetch(path, {
-    headers: { "Content-Type": "application/json" },
+    headers: { "Content-Type": "application/json", "X-Client-Id": clientId },
     ...options,
   });
 
@@ -357,10 +365,82 @@ function refreshLastMoveFromHistory() {
   applyLastMoveFromToken(moveHistory[moveHistory.length - 1]);
 }
 
+function applyDelta(delta) {
+  // Our own actions already updated the view from their HTTP response.
+  if (!gameState || delta.origin === clientId) {
+    return;
+  }
+
+  Object.entries(delta.squares || {}).forEach(([name, piece]) => {
+    const parsed = parseSquare(name);
+    if (parsed) {
+      gameState.board[parsed.row][parsed.col] = piece;
+    }
+  });
+
+  [
+    "version",
+    "turn",
+    "fullmove_number",
+    "halfmove_clock",
+    "castling_rights",
+    "en_passant_target",
+    "check",
+    "ended",
+    "result",
+    "winner",
+    "message",
+  ].forEach((key) => {
+    gameState[key] = delta[key];
+  });
+  gameState.legal_moves = null;
+
+  if (delta.type === "move") {
+    applyLastMoveFromToken(delta.move);
+    pushMoveHistory(delta.move);
+  } else if (delta.type === "undo") {
+    removeLastMoves(delta.undone_steps);
+    refreshLastMoveFromHistory();
+  } else if (delta.type === "reset") {
+    moveHistory = [];
+    renderMoveHistory();
+    lastMove = null;
+  }
+
+  clearSelection();
+  renderMeta();
+  renderBoard();
+  updateControls();
+  setMessage(delta.message);
+}
+
+function subscribeToEvents() {
+  if (eventSource) {
+    eventSource.close();
+    eventSource = null;
+  }
+  if (!gameId || !window.EventSource) {
+    return;
+  }
+
+  eventSource = new EventSource(`/api/games/${gameId}/events`);
+  // Sent on every (re)connect, so a dropped stream resyncs the board.
+  eventSource.addEventListener("state", (event) => {
+    gameState = JSON.parse(event.data);
+    renderMeta();
+    renderBoard();
+    updateControls();
+  });
+  eventSource.addEventListener("delta", (event) => {
+    applyDelta(JSON.parse(event.data));
+  });
+}
+
 async function createGame() {
   const state = await api("/api/games", { method: "POST" });
   gameId = state.game_id;
   gameState = state;
+  subscribeToEvents();
   moveHistory = [];
   renderMoveHistory();
   lastMove = null;
@@ -428,6 +508,18 @@ async function playMove(payload, moveToken) {
   }
 }
 
+async function waitForJob(jobId) {
+  while (true) {
+    const job = await api(`/api/jobs/${jobId}?wait=25000`);
+    if (job.status === "done") {
+      return job.result;
+    }
+    if (job.status !== "queued" && job.status !== "running") {
+      throw new Error(job.error || `Engine job ${job.status}.`);
+    }
+  }
+}
+
 async function requestEngineMove() {
   if (!gameState || gameState.ended || !gameId) {
     return false;
@@ -438,13 +530,15 @@ async function requestEngineMove() {
     updateControls();
     setMessage("Engine thinking...");
 
-    const state = await api(`/api/games/${gameId}/engine-move`, {
+    const job = await api(`/api/games/${gameId}/engine-move`, {
       method: "POST",
       body: JSON.stringify({
         level: engineLevelSelect.value || "hard",
         use_stockfish: true,
+        async: true,
       }),
     });
+    const state = await waitForJob(job.job_id);
 
     gameState = state;
     const played = state.played_move || "";
@@ -0,0 +1,27 @@
+# Minimal UCI engine used in place of Stockfish by the pool tests. It always
+# plays e2e4 and reports how many times it has been told to start a new game.
+import sys
+
+
+def main():
+    new_games = 0
+    for line in sys.stdin:
+        command = line.strip()
+        if command == "uci":
+            print("id name FakeFish")
+            print("option name Skill Level type spin default 20 min 0 max 20")
+            print("uciok")
+        elif command == "isready":
+            print("readyok")
+        elif command == "ucinewgame":
+            new_games += 1
+        elif command.startswith("go"):
+            print(f"info string new_games {new_games}")
+            print("bestmove e2e4")
+        elif command == "quit":
+            break
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import builtins
+import random
+
+import pytest
+
+from chess_engine import book as book_module
+from chess_engine.book import (
+    RECORD_SIZE,
+    OpeningBook,
+    book_move_to_uci,
+    build_book,
+    get_opening_book,
+    main,
+)
+from chess_engine.engine import choose_engine_move
+from chess_engine.game import Game
+from chess_engine.models import encode_move
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "1-0"]
+
+1. e4 c5 2. Nf3 d6 1-0
+
+[Result "0-1"]
+
+1. d4 d5 2. c4 e6 0-1
+
+[Result "1/2-1/2"]
+
+1. e4 e5 2. Bc4 Nf6 1/2-1/2
+"""
+
+
+def _build(tmp_path, max_ply=24):
+    path = tmp_path / "book.bin"
+    stats = build_book(PGN.splitlines(), str(path), max_ply=max_ply)
+    return path, stats
+
+
+def test_build_book_weights_moves_by_result(tmp_path):
+    path, stats = _build(tmp_path)
+
+    assert stats["games"] == 4
+    assert path.stat().st_size == stats["entries"] * RECORD_SIZE
+    with OpeningBook(str(path)) as book:
+        assert len(book) == stats["entries"]
+        # 1. d4 and 1... c5 only appear in losses, so they never make the book.
+        game = Game()
+        assert book.entries(game.position_hash) == [("e2e4", 5)]
+        game.apply_uci_move("e2e4")
+        assert book.entries(game.position_hash) == [("e7e5", 1)]
+
+
+def test_lookup_misses_and_max_ply(tmp_path):
+    path, stats = _build(tmp_path, max_ply=1)
+
+    assert stats["positions"] == 1
+    with OpeningBook(str(path)) as book:
+        game = Game()
+        game.apply_uci_move("e2e4")
+        assert book.entries(game.position_hash) == []
+        assert book.choose(game) is None
+
+
+def test_book_moves_use_the_packed_move_encoding():
+    game = Game.from_fen("4k3/1P6/8/8/8/8/8/4K2R w K - 0 1")
+    for move, promotion in game.get_legal_moves():
+        assert book_move_to_uci(encode_move(move, promotion)) == game.move_to_uci(move, promotion)
+
+
+def test_file_is_closed_when_mapping_fails(tmp_path, monkeypatch):
+    path, _ = _build(tmp_path)
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(builtins.open(*args, **kwargs))
+        return opened[-1]
+
+    def failing_mmap(*args, **kwargs):
+        raise OSError("mmap failed")
+
+    monkeypatch.setattr(book_module, "open", tracking_open, raising=False)
+    monkeypatch.setattr(book_module.mmap, "mmap", failing_mmap)
+    with pytest.raises(OSError):
+        OpeningBook(str(path))
+    assert opened and opened[0].closed
+
+
+def test_choice_respects_level(tmp_path):
+    path, _ = _build(tmp_path)
+    with OpeningBook(str(path)) as book:
+        game = Game()
+        game.apply_uci_move("e2e4")
+        game.apply_uci_move("e7e5")
+
+        # White scored a win after Nf3 and a draw after Bc4.
+        assert sorted(book.legal_entries(game)) == [("f1c4", 1), ("g1f3", 2)]
+        assert book.choose(game, "very_hard") == "g1f3"
+        rng = random.Random(1)
+        picks = {book.choose(game, "easy", rng) for _ in range(50)}
+        assert picks == {"f1c4", "g1f3"}
+
+
+def test_engine_plays_from_book(tmp_path, monkeypatch):
+    path, _ = _build(tmp_path)
+    monkeypatch.setattr(book_module, "_book", None)
+    monkeypatch.setattr(book_module, "_book_path", None)
+    monkeypatch.setenv("CHESS_BOOK_PATH", str(path))
+
+    game = Game()
+    assert choose_engine_move(game, use_stockfish=False, level="very_hard") == ("e2e4", "book")
+
+    game.apply_uci_move("a2a3")
+    move, source = choose_engine_move(game, use_stockfish=False, level="easy")
+    assert source != "book"
+
+    move, source = choose_engine_move(Game(), use_stockfish=False, level="easy", use_book=False)
+    assert source != "book"
+
+
+def test_missing_book_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(book_module, "_book", None)
+    monkeypatch.setattr(book_module, "_book_path", None)
+    monkeypatch.delenv("CHESS_BOOK_PATH", raising=False)
+    assert get_opening_book() is None
+    assert get_opening_book(str(tmp_path / "missing.bin")) is None
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    book = get_opening_book(str(empty))
+    assert book.entries(Game().position_hash) == []
+    book.close()
+
+
+def test_cli_builds_book(tmp_path, capsys):
+    source = tmp_path / "games.pgn"
+    source.write_text(PGN)
+    output = tmp_path / "book.bin"
+
+    assert main([str(source), "-o", str(output), "--max-ply", "2"]) == 0
+    assert "4 games" in capsys.readouterr().out
+    assert output.stat().st_size > 0
@@ -1,3 +1,6 @@
+import pytest
+
+from chess_engine.engine import get_transposition_table
 from web_app import app
 
 
@@ -52,3 +55,135 @@ def test_engine_levels_supported():
             payload = moved.get_json()
             assert payload["move_source"] == "fallback"
             assert payload["played_move"]
+
+
+def test_engine_stats_endpoint_reports_table_counters():
+    with app.test_client() as client:
+        created = client.post("/api/games")
+        game_id = created.get_json()["game_id"]
+        client.post(
+            f"/api/games/{game_id}/engine-move",
+            json={"level": "very_hard", "use_stockfish": False, "think_time_ms": 100},
+        )
+
+        stats = client.get("/api/engine/stats").get_json()["transposition_table"]
+        assert stats["entries"] > 0
+        assert stats["hits"] + stats["misses"] > 0
+
+
+def test_engine_move_payload_cannot_resize_shared_table():
+    table = get_transposition_table()
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+        moved = client.post(
+            f"/api/games/{game_id}/engine-move",
+            json={"use_stockfish": False, "think_time_ms": 50, "tt_entries": 1 << 22},
+        )
+        assert moved.status_code == 200
+
+    assert get_transposition_table() is table
+
+
+def test_create_game_from_fen():
+    fen = "4k3/8/8/8/8/8/4P3/4K3 b - - 5 40"
+    with app.test_client() as client:
+        created = client.post("/api/games", json={"fen": fen})
+        assert created.status_code == 200
+        payload = created.get_json()
+        assert payload["turn"] == "b"
+        assert payload["fullmove_number"] == 40
+        assert payload["board"][6][4] == "wP"
+
+        rejected = client.post("/api/games", json={"fen": "not a fen"})
+        assert rejected.status_code == 400
+
+        for bad_fen in (5, ["8/8/8/8/8/8/8/8 w - - 0 1"], {"fen": fen}):
+            rejected = client.post("/api/games", json={"fen": bad_fen})
+            assert rejected.status_code == 400
+
+
+def test_legal_move_map_endpoint_and_state_payload():
+    with app.test_client() as client:
+        created = client.post(
+            "/api/games",
+            json={"fen": "4k3/1P6/8/8/8/8/8/4K3 w - - 0 1"},
+        )
+        game_id = created.get_json()["game_id"]
+        assert created.get_json()["legal_moves"]["b7"][0]["promotion"] is True
+
+        full = client.get(f"/api/games/{game_id}/legal-moves")
+        moves = full.get_json()["moves"]
+        assert set(moves) == {"b7", "e1"}
+        assert moves["b7"] == [{"to": "b8", "promotion": True}]
+        assert all(target["promotion"] is False for target in moves["e1"])
+
+        single = client.get(f"/api/games/{game_id}/legal-moves?from=b7")
+        assert single.get_json() == {"from": "b7", "targets": ["b8"], "promotions": ["b8"]}
+
+        empty = client.get(f"/api/games/{game_id}/legal-moves?from=e8")
+        assert empty.get_json()["targets"] == []
+
+
+def test_batch_analysis_endpoint():
+    with app.test_client() as client:
+        response = client.post(
+            "/api/analysis/batch",
+            json={
+                "positions": [
+                    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                    {"moves": ["f2f3", "e7e5", "g2g4", "d8h4"]},
+                ],
+                "max_depth": 1,
+            },
+        )
+        assert response.status_code == 200
+        results = response.get_json()["results"]
+        assert len(results) == 2
+        assert len(results[0]["best_move"]) == 4
+        assert results[1]["outcome"]["winner"] == "b"
+
+        assert client.post("/api/analysis/batch", json={"positions": []}).status_code == 400
+
+
+def test_batch_analysis_static_mode():
+    with app.test_client() as client:
+        response = client.post(
+            "/api/analysis/batch",
+            json={
+                "mode": "static",
+                "positions": [
+                    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                    "4k3/8/8/8/8/8/8/3QK3 b - - 0 1",
+                    {"moves": ["e2e5"]},
+                ],
+            },
+        )
+        assert response.status_code == 200
+        results = response.get_json()["results"]
+        assert results[0]["score"] == 0
+        assert results[1]["score"] < -800
+        assert "error" in results[2]
+
+        bad = client.post("/api/analysis/batch", json={"mode": "deep", "positions": ["x"]})
+        assert bad.status_code == 400
+
+
+@pytest.mark.parametrize("mode", ["search", "static"])
+def test_batch_analysis_reports_malformed_items_individually(mode):
+    with app.test_client() as client:
+        response = client.post(
+            "/api/analysis/batch",
+            json={
+                "mode": mode,
+                "max_depth": 1,
+                "positions": [
+                    {"fen": 5},
+                    "4k3/8/8/8/8/8/8/3QK3 b - - 0 1",
+                    {"moves": 5},
+                    {"moves": {"e2e4": True}},
+                ],
+            },
+        )
+        assert response.status_code == 200
+        results = response.get_json()["results"]
+        assert [("error" in result) for result in results] == [True, False, True, True]
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from chess_engine.jobs import CANCELLED, DONE, TIMED_OUT, JobQueue, QueueFullError
+from web_app import app
+
+
+def test_async_engine_move_completes_through_polling():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+
+        submitted = client.post(
+            f"/api/games/{game_id}/engine-move",
+            json={"async": True, "level": "easy", "use_stockfish": False},
+        )
+        assert submitted.status_code == 202
+        job_id = submitted.get_json()["job_id"]
+
+        polled = client.get(f"/api/jobs/{job_id}?wait=5000").get_json()
+        assert polled["status"] == DONE
+        assert polled["result"]["move_side"] == "w"
+        assert client.get(f"/api/games/{game_id}").get_json()["turn"] == "b"
+
+
+def test_async_engine_move_can_be_cancelled():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+
+        submitted = client.post(
+            f"/api/games/{game_id}/engine-move",
+            json={
+                "async": True,
+                "level": "very_hard",
+                "use_stockfish": False,
+                "think_time_ms": 3000,
+            },
+        )
+        job_id = submitted.get_json()["job_id"]
+
+        client.delete(f"/api/jobs/{job_id}")
+        polled = client.get(f"/api/jobs/{job_id}?wait=5000").get_json()
+        assert polled["status"] == CANCELLED
+        assert client.get(f"/api/games/{game_id}").get_json()["turn"] == "w"
+
+
+def test_unknown_job_returns_404():
+    with app.test_client() as client:
+        assert client.get("/api/jobs/missing").status_code == 404
+
+
+def test_job_queue_rejects_work_beyond_pending_limit():
+    release = threading.Event()
+    queue = JobQueue(max_workers=1, max_pending=1)
+    try:
+        queue.submit(lambda job: release.wait(5), timeout_ms=5000)
+        with pytest.raises(QueueFullError):
+            queue.submit(lambda job: None, timeout_ms=5000)
+    finally:
+        release.set()
+        queue.shutdown()
+
+
+def test_queued_jobs_finish_when_cancelled_or_expired():
+    release = threading.Event()
+    queue = JobQueue(max_workers=1, max_pending=4)
+    try:
+        queue.submit(lambda job: release.wait(5), timeout_ms=5000)
+        cancelled = queue.submit(lambda job: "ran", timeout_ms=5000)
+        expired = queue.submit(lambda job: "ran", timeout_ms=0)
+
+        assert queue.cancel(cancelled.id).status == CANCELLED
+        assert cancelled.finished_at is not None
+        assert queue.get(expired.id).status == TIMED_OUT
+        assert queue.pending_count() == 1
+
+        release.set()
+        queue.shutdown()
+        assert cancelled.result is None and expired.result is None
+    finally:
+        release.set()
+        queue.shutdown()
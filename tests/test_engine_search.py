@@ -0,0 +1,118 @@
+from chess_engine import engine
+from chess_engine.engine import (
+    MATE_SCORE,
+    MAX_SEARCH_DEPTH,
+    TT_EXACT,
+    TT_LOWER,
+    TT_UPPER,
+    TranspositionTable,
+    analyze_positions,
+    search_best_move,
+)
+
+from tests.helpers import clear_board, reset_tracking
+
+
+def test_search_finds_back_rank_mate(game):
+    clear_board(game, turn="w")
+    game.board[0][6] = "bK"
+    game.board[1][5] = game.board[1][6] = game.board[1][7] = "bP"
+    game.board[7][0] = "wR"
+    game.board[7][6] = "wK"
+    reset_tracking(game)
+
+    result = search_best_move(game, think_time_ms=500, max_depth=3)
+    assert result["move"] == "a1a8"
+    assert result["score"] >= MATE_SCORE - 10
+
+
+def test_search_wins_hanging_queen_without_touching_game(game):
+    clear_board(game, turn="b")
+    game.board[0][4] = "bK"
+    game.board[2][3] = "bN"  # d6
+    game.board[4][4] = "wQ"  # e4, undefended
+    game.board[7][4] = "wK"
+    reset_tracking(game)
+    fen = game.to_fen()
+
+    result = search_best_move(game, think_time_ms=500, max_depth=2)
+    assert result["move"] == "d6e4"
+    assert game.to_fen() == fen
+
+
+def test_search_reaches_depth_five_within_node_budget(game):
+    # Pruning (null move, futility, late-move reductions) keeps depth 5 from
+    # the start position to a few thousand nodes; about 0.3s here.
+    table = TranspositionTable(1 << 14)
+    result = search_best_move(game, think_time_ms=30000, max_depth=5, tt=table)
+    assert result["depth"] == 5
+    assert result["nodes"] < 10000
+
+
+def test_stop_request_is_honoured_during_the_first_iteration(game, monkeypatch):
+    monkeypatch.setattr(engine, "_TIME_CHECK_INTERVAL", 1)
+
+    result = search_best_move(game, think_time_ms=30000, should_stop=lambda: True)
+
+    assert result["depth"] == 0
+    assert game.parse_uci_move(result["move"])[0] is not None
+
+
+def test_transposition_table_replacement_and_counters():
+    table = TranspositionTable(4)
+    table.new_search()
+
+    table.store(3, 5, TT_EXACT, 10, None)
+    table.store(5, 1, TT_LOWER, 20, None)  # same bucket, shallower
+    assert table.probe(3)[1] == 5
+    assert table.probe(5)[3] == 20
+    assert table.probe(7) is None
+    assert table.stats()["hits"] == 2
+    assert table.stats()["misses"] == 1
+
+    table.new_search()
+    table.store(7, 1, TT_UPPER, 0, None)  # stale deep entry gives way
+    assert table.probe(3) is None
+    assert table.probe(7) is not None
+
+
+def test_search_populates_transposition_table(game):
+    table = TranspositionTable(4096)
+    search_best_move(game, think_time_ms=200, max_depth=3, tt=table)
+    stats = table.stats()
+    assert stats["stores"] > 0
+    assert stats["hits"] + stats["misses"] > 0
+
+
+def test_analyze_positions_reports_move_score_and_outcome():
+    items = [
+        "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+        {"moves": ["f2f3", "e7e5", "g2g4", "d8h4"]},
+        {"moves": "e2e4 e7e5"},
+        {"moves": ["e2e5"]},
+        "not a fen",
+    ]
+
+    results = analyze_positions(items, think_time_ms=2000, max_depth=2, workers=1)
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert results[0]["best_move"] == "f3f7"
+    assert results[0]["score"] >= MATE_SCORE - MAX_SEARCH_DEPTH
+    assert results[1]["outcome"]["result"] == "checkmate"
+    assert results[1]["best_move"] is None
+    assert results[2]["turn"] == "w"
+    assert results[2]["best_move"] is not None
+    assert results[3]["error"] == "Illegal move at ply 1: e2e5"
+    assert "error" in results[4]
+
+
+def test_analyze_positions_over_process_pool_keeps_input_order():
+    items = [{"moves": ["e2e4"]}, {"moves": ["d2d4", "d7d5"]}, {"moves": ["e2e5"]}]
+
+    results = analyze_positions(items, think_time_ms=5000, max_depth=2, workers=2)
+
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["turn"] == "b"
+    assert results[1]["turn"] == "w"
+    assert results[0]["best_move"] and results[1]["best_move"]
+    assert results[2]["error"] == "Illegal move at ply 1: e2e5"
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from chess_engine import evaluation
+from chess_engine.evaluation import (
+    MAX_PHASE,
+    compute_eval_terms,
+    evaluate,
+    evaluate_batch,
+    mobility,
+    pawn_structure,
+    taper,
+)
+from chess_engine.game import Game
+
+from tests.helpers import clear_board, reset_tracking
+
+
+def test_start_position_is_balanced(game):
+    mg, eg, phase, _ = game.eval_terms
+    assert (mg, eg) == (0, 0)
+    assert phase == MAX_PHASE
+    assert evaluate(game, "w") == 0
+    assert evaluate(game, "b") == 0
+
+
+def test_terms_stay_in_sync_through_make_unmake_and_undo():
+    rng = random.Random(5)
+    for _ in range(20):
+        game = Game()
+        for _ in range(80):
+            legal = game.get_legal_moves()
+            if not legal:
+                break
+            move, promotion = rng.choice(legal)
+            record = game.make_move(move, promotion)
+            assert game.eval_terms == compute_eval_terms(game.board)
+            game.unmake_move(record)
+            game.commit_move(move, promotion)
+
+        while game.undo_last_move():
+            assert game.eval_terms == compute_eval_terms(game.board)
+        assert game.eval_terms == Game().eval_terms
+
+
+def test_taper_blends_by_phase():
+    assert taper(100, 40, MAX_PHASE) == 100
+    assert taper(100, 40, 0) == 40
+    assert taper(100, 40, MAX_PHASE // 2) == 70
+    assert taper(100, 40, MAX_PHASE + 8) == 100
+
+
+def test_pawn_structure_rewards_passers_and_punishes_weaknesses(game):
+    clear_board(game)
+    game.board[7][4] = "wK"
+    game.board[0][4] = "bK"
+    game.board[1][0] = "wP"
+    game.board[6][7] = "wP"
+    game.board[5][7] = "wP"
+    game.board[1][6] = "bP"
+    reset_tracking(game)
+
+    mg, eg = pawn_structure(game.board, game.eval_terms[3])
+    # a7 is a far-advanced passer; the doubled h-pawns are isolated.
+    assert eg > 0
+    assert pawn_structure(game.board, game.eval_terms[3]) == (mg, eg)
+
+
+def test_mobility_and_lazy_window(game):
+    clear_board(game)
+    game.board[7][4] = "wK"
+    game.board[0][4] = "bK"
+    game.board[4][3] = "wQ"
+    reset_tracking(game)
+
+    mg, eg = mobility(game.board)
+    assert mg == 27
+    full = evaluate(game, "w")
+    assert full > 0
+    assert evaluate(game, "w", alpha=full + 1000, beta=full + 2000) < full
+    assert evaluate(game, "w", alpha=full - 10, beta=full + 10) == full
+    assert evaluate(game, "b") == -full
+
+
+def _random_boards(count, seed=9):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        game = Game()
+        for _ in range(rng.randint(0, 60)):
+            legal = game.get_legal_moves()
+            if not legal:
+                break
+            game.commit_move(*rng.choice(legal))
+        boards.append([row[:] for row in game.board])
+    return boards
+
+
+def test_batch_scores_match_per_board_terms():
+    pytest.importorskip("numpy")
+    boards = _random_boards(40)
+    expected = [taper(*compute_eval_terms(board)[:3]) for board in boards]
+
+    assert evaluate_batch(boards) == expected
+
+    codes = evaluation.pack_square_codes(boards)
+    assert codes.shape == (40, 64)
+    assert (codes < len(evaluation.PLANE_PIECES)).sum() == sum(
+        piece != "." for board in boards for row in board for piece in row
+    )
+
+
+def test_batch_scoring_without_numpy(monkeypatch):
+    boards = _random_boards(10, seed=3)
+    expected = [taper(*compute_eval_terms(board)[:3]) for board in boards]
+    monkeypatch.setattr(evaluation, "np", None)
+
+    assert evaluate_batch(boards, perspectives=["b"] * 10) == [-score for score in expected]
+    assert evaluate_batch([]) == []
+    with pytest.raises(RuntimeError):
+        evaluation.pack_square_codes(boards)
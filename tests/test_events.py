@@ -0,0 +1,133 @@
+import json
+
+from chess_engine.board_state import create_initial_board
+from chess_engine.events import EventBroker, board_changes
+from web_app import _events, app
+
+
+def _read_event(chunks):
+    chunk = next(chunks)
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode()
+    name_line, data_line = chunk.strip().split("\n")
+    return name_line[len("event: "):], json.loads(data_line[len("data: "):])
+
+
+def test_board_changes_lists_only_changed_squares():
+    before = create_initial_board()
+    after = [row[:] for row in before]
+    after[6][4] = "."
+    after[4][4] = "wP"
+    assert board_changes(before, after) == {"e2": ".", "e4": "wP"}
+
+
+def test_slow_subscriber_is_dropped_and_closed():
+    broker = EventBroker(queue_size=2)
+    slow = broker.subscribe("g")
+    fast = broker.subscribe("g")
+
+    for index in range(2):
+        broker.publish("g", index)
+        assert fast.get_nowait() == index
+
+    broker.publish("g", 2)
+    assert slow.get_nowait() is None
+    assert fast.get_nowait() == 2
+    assert broker.subscriber_count() == 1
+    assert broker.dropped == 1
+
+    broker.unsubscribe("g", fast)
+    assert broker.subscriber_count() == 0
+    assert broker.publish("g", 3) == 0
+
+
+def test_event_stream_pushes_move_and_undo_deltas():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+
+        stream = client.get(f"/api/games/{game_id}/events", buffered=False)
+        assert stream.mimetype == "text/event-stream"
+        chunks = iter(stream.response)
+
+        name, state = _read_event(chunks)
+        assert name == "state"
+        assert state["turn"] == "w"
+
+        client.post(
+            f"/api/games/{game_id}/moves",
+            json={"move": "e2e4"},
+            headers={"X-Client-Id": "tab-1"},
+        )
+        name, delta = _read_event(chunks)
+        assert name == "delta"
+        assert delta["type"] == "move"
+        assert delta["move"] == "e2e4"
+        assert delta["squares"] == {"e2": ".", "e4": "wP"}
+        assert delta["turn"] == "b"
+        assert delta["en_passant_target"] == [5, 4]
+        assert delta["origin"] == "tab-1"
+        assert "board" not in delta
+
+        client.post(f"/api/games/{game_id}/undo", json={})
+        name, delta = _read_event(chunks)
+        assert delta["type"] == "undo"
+        assert delta["undone_steps"] == 1
+        assert delta["squares"] == {"e2": "wP", "e4": "."}
+        assert delta["origin"] is None
+
+        stream.close()
+        assert _events.subscriber_count() == 0
+
+
+def test_conditional_get_returns_304_until_the_game_changes():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+
+        first = client.get(f"/api/games/{game_id}")
+        etag = first.headers["ETag"]
+        assert first.get_json()["version"] == 0
+
+        cached = client.get(f"/api/games/{game_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        client.post(f"/api/games/{game_id}/moves", json={"move": "e2e4"})
+        fresh = client.get(f"/api/games/{game_id}", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["ETag"] != etag
+        assert fresh.get_json()["version"] == 1
+
+
+def test_changes_since_version_and_reset_keeps_counting():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+        client.post(f"/api/games/{game_id}/moves", json={"move": "e2e4"})
+        client.post(f"/api/games/{game_id}/moves", json={"move": "e7e5"})
+
+        delta = client.get(f"/api/games/{game_id}?since=1").get_json()
+        assert delta["version"] == 2
+        assert [change["move"] for change in delta["changes"]] == ["e7e5"]
+        assert delta["changes"][0]["squares"] == {"e7": ".", "e5": "bP"}
+        assert "board" not in delta
+
+        current = client.get(f"/api/games/{game_id}?since=2").get_json()
+        assert current["changes"] == []
+
+        reset = client.post(f"/api/games/{game_id}/reset").get_json()
+        assert reset["version"] == 3
+
+        # Older than anything logged or from the future: full snapshot.
+        assert "board" in client.get(f"/api/games/{game_id}?since=9").get_json()
+        assert "board" in client.get(f"/api/games/{game_id}?since=x").get_json()
+
+
+def test_event_history_is_bounded():
+    broker = EventBroker(history_size=2)
+    for version in range(1, 5):
+        broker.publish("g", {"version": version})
+
+    assert broker.events_since("g", 2) == [{"version": 3}, {"version": 4}]
+    assert broker.events_since("g", 1) is None
+
+    broker.forget("g")
+    assert broker.events_since("g", 3) is None
@@ -37,6 +37,21 @@ def test_castling_kingside():
     assert game.board[7][5] == "wR"
 
 
+def test_castling_through_attacked_square_rejected():
+    game = Game()
+    clear_board(game, turn="w")
+    game.board[7][4] = "wK"
+    game.board[7][7] = "wR"
+    game.board[0][4] = "bK"
+    game.board[2][0] = "bB"  # a6 covers f1
+    game.castling_rights = {"wK": True, "wQ": False, "bK": False, "bQ": False}
+    reset_tracking(game)
+
+    assert game.is_square_attacked(game.board, 7, 5, "b")
+    assert not game.is_square_attacked(game.board, 7, 6, "b")
+    assert game.build_move(7, 4, 7, 6, color="w") is None
+
+
 def test_en_passant_capture():
     game = Game()
     play_move(game, "e2", "e4")
@@ -91,3 +106,68 @@ def test_insufficient_material_detection():
     game.board[1][6] = "wN"
     reset_tracking(game)
     assert not game.is_insufficient_material()
+
+
+def test_position_hash_matches_transpositions_and_undo():
+    first = Game()
+    for start, end in (("g1", "f3"), ("g8", "f6"), ("b1", "c3")):
+        play_move(first, start, end)
+
+    second = Game()
+    for start, end in (("b1", "c3"), ("g8", "f6"), ("g1", "f3")):
+        play_move(second, start, end)
+
+    assert first.get_position_key() == second.get_position_key()
+
+    initial_key = Game().get_position_key()
+    first.undo_last_move(3)
+    assert first.get_position_key() == initial_key
+    assert first.position_counts == {initial_key: 1}
+
+
+def test_outcome_is_cached_per_position_and_refreshed_on_move_and_undo(monkeypatch):
+    game = Game()
+    play_move(game, "f2", "f3")
+    play_move(game, "e7", "e5")
+    play_move(game, "g2", "g4")
+
+    calls = []
+    original = game.has_any_legal_moves
+    monkeypatch.setattr(
+        game,
+        "has_any_legal_moves",
+        lambda color: calls.append(color) or original(color),
+    )
+
+    assert game.get_outcome()["ended"] is False
+    assert game.get_outcome()["ended"] is False
+    assert len(calls) == 1
+
+    play_move(game, "d8", "h4")
+    outcome = game.get_outcome()
+    assert outcome["result"] == "checkmate"
+    assert outcome["winner"] == "b"
+
+    game.undo_last_move()
+    assert game.get_outcome()["ended"] is False
+    assert len(calls) == 3
+
+
+def test_legal_move_map_is_cached_until_the_next_move(game, monkeypatch):
+    calls = []
+    original = game.get_legal_moves
+    monkeypatch.setattr(game, "get_legal_moves", lambda: calls.append(1) or original())
+
+    move_map = game.get_legal_move_map()
+    assert sum(len(targets) for targets in move_map.values()) == 20
+    assert {target["to"] for target in move_map["g1"]} == {"f3", "h3"}
+
+    move_map["g1"].clear()
+    assert len(game.get_legal_move_map()["g1"]) == 2
+    assert len(calls) == 1
+
+    play_move(game, "e2", "e4")
+    assert "e7" in game.get_legal_move_map()
+    game.undo_last_move()
+    assert "e2" in game.get_legal_move_map()
+    assert len(calls) == 3
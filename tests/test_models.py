@@ -0,0 +1,45 @@
+import pytest
+
+from chess_engine.models import (
+    Move,
+    decode_move,
+    encode_move,
+    packed_from_square,
+    packed_promotion,
+    packed_to_square,
+)
+
+from tests.helpers import clear_board, reset_tracking
+
+
+def test_move_has_no_instance_dict():
+    move = Move(sr=6, sc=4, dr=4, dc=4, piece="wP")
+    assert not hasattr(move, "__dict__")
+
+
+@pytest.mark.parametrize("turn", ["w", "b"])
+def test_packed_moves_round_trip_every_legal_move(game, turn):
+    clear_board(game, turn=turn)
+    game.board[7][4] = "wK"
+    game.board[7][0] = "wR"
+    game.board[7][7] = "wR"
+    game.board[0][4] = "bK"
+    game.board[0][0] = "bR"
+    game.board[1][6] = "wP"  # g7, promotes with or without capture
+    game.board[0][7] = "bN"
+    game.board[3][3] = "wP"  # d5
+    game.board[3][4] = "bP"  # e5, just pushed
+    game.board[6][1] = "bP"  # b2, promotes on a1/b1
+    game.castling_rights = {"wK": True, "wQ": True, "bK": False, "bQ": True}
+    game.en_passant_target = (2, 4) if turn == "w" else None
+    reset_tracking(game)
+
+    legal = game.get_legal_moves()
+    assert legal
+    for move, promotion in legal:
+        packed = encode_move(move, promotion)
+        assert 0 <= packed < 1 << 16
+        assert packed_promotion(packed) == promotion
+        assert divmod(packed_from_square(packed), 8) == (move.sr, move.sc)
+        assert divmod(packed_to_square(packed), 8) == (move.dr, move.dc)
+        assert decode_move(packed, game.board) == (move, promotion)
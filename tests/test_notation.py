@@ -1,6 +1,7 @@
 import pytest
 
-from chess_engine.notation import parse_move_input
+from chess_engine.game import Game
+from chess_engine.notation import convert_position, parse_move_input
 
 
 def test_parse_compact_and_spaced_moves():
@@ -17,3 +18,33 @@ def test_parse_castling_aliases():
 def test_parse_invalid_move_raises():
     with pytest.raises(ValueError):
         parse_move_input("e2", "w")
+
+
+def test_from_fen_round_trips_full_position():
+    fen = "r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 3 27"
+    game = Game.from_fen(fen)
+    assert game.to_fen() == fen
+    assert game.castling_rights == {"wK": True, "wQ": False, "bK": False, "bQ": True}
+    assert game.en_passant_target == convert_position("d6")
+    assert game.build_move(*convert_position("e5"), *convert_position("d6")).special == (
+        "en_passant"
+    )
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0",
+        "8/8/8/8/8/8/8/8 w - - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 x - - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w K - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w - e3 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w - - -1 1",
+        "4k3/8/8/8/8/8/8/4K3 w - - 0 0",
+        "4k3/8/8/8/8/8/8/P3K3 w - - 0 1",
+        "4k3/4R3/8/8/8/8/8/4K3 w - - 0 1",
+    ],
+)
+def test_from_fen_rejects_invalid_positions(fen):
+    with pytest.raises(ValueError):
+        Game.from_fen(fen)
@@ -0,0 +1,51 @@
+import pytest
+
+from chess_engine.game import Game
+from chess_engine.perft import STANDARD_POSITIONS, divide, perft, run_suite
+
+
+@pytest.mark.parametrize(
+    "name,fen,expected_counts",
+    STANDARD_POSITIONS,
+    ids=[position[0] for position in STANDARD_POSITIONS],
+)
+def test_perft_matches_published_counts(name, fen, expected_counts):
+    game = Game.from_fen(fen)
+    assert perft(game, 2) == expected_counts[2]
+    assert game.to_fen() == fen
+
+
+def test_divide_sums_to_perft():
+    game = Game.from_fen(STANDARD_POSITIONS[1][1])
+    split = divide(game, 2)
+    assert len(split) == 48
+    assert sum(split.values()) == 2039
+
+
+def test_suite_reports_throughput():
+    results = run_suite(max_depth=1)
+    assert all(result["ok"] for result in results)
+    assert all(result["nps"] > 0 for result in results)
+
+
+def _move_set(moves):
+    return {(move.sr, move.sc, move.dr, move.dc, move.special) for move in moves}
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [position[1] for position in STANDARD_POSITIONS],
+    ids=[position[0] for position in STANDARD_POSITIONS],
+)
+def test_capture_generation_matches_filtered_moves(fen):
+    game = Game.from_fen(fen)
+    for move, promotion in [(None, None)] + game.get_legal_moves():
+        record = game.make_move(move, promotion) if move else None
+        expected = [
+            move
+            for move in game.generate_pseudo_legal_moves()
+            if move.is_capture or move.promotion
+        ]
+        assert _move_set(game.generate_pseudo_legal_captures()) == _move_set(expected)
+        if record:
+            game.unmake_move(record)
@@ -0,0 +1,115 @@
+import io
+
+import pytest
+
+from chess_engine.game import Game
+from chess_engine.pgn import (
+    format_game,
+    game_to_san,
+    move_to_san,
+    parse_san,
+    read_games,
+    replay_game,
+    write_game,
+)
+
+from tests.helpers import clear_board, reset_tracking
+
+
+SAMPLE = """% exported by a test
+[Event "Casual \\"blitz\\""]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 {best by test
+spanning lines} e5 2.Nf3 $1 Nc6 (2... d6 3. d4 {Philidor} (3. Bc4)) 3. Bb5 a6 ; to end of line
+4. Ba4 Nf6 5. O-O!? 1-0
+
+[Event "No result token"]
+
+1. d4 d5
+[Event "Scholar"]
+1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6?? 4. Qxf7# 1-0
+"""
+
+
+def test_read_games_streams_records_skipping_comments_variations_and_nags():
+    records = list(read_games(io.StringIO(SAMPLE)))
+
+    assert len(records) == 3
+    first = records[0]
+    assert first["headers"]["Event"] == 'Casual "blitz"'
+    assert first["result"] == "1-0"
+    assert first["moves"] == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O!?"]
+
+    assert records[1]["moves"] == ["d4", "d5"]
+    assert records[1]["result"] == "*"
+
+    scholar = replay_game(records[2])
+    assert scholar.get_outcome()["result"] == "checkmate"
+
+
+def test_replay_game_reports_the_bad_ply():
+    record = {"headers": {}, "moves": ["e4", "e5", "Ke3"]}
+    with pytest.raises(ValueError, match="Ply 3"):
+        replay_game(record)
+
+
+def test_san_disambiguation_promotion_and_check(game):
+    clear_board(game, turn="w")
+    game.board[7][0] = "wK"
+    game.board[0][0] = "bK"
+    game.board[7][3] = "wR"
+    game.board[7][7] = "wR"
+    game.board[3][1] = "wN"
+    game.board[3][5] = "wN"
+    game.board[1][2] = "wP"
+    reset_tracking(game)
+
+    assert parse_san(game, "Rdf1")[0].sc == 3
+    assert parse_san(game, "Nbd4")[0].sc == 1
+    with pytest.raises(ValueError, match="Ambiguous"):
+        parse_san(game, "Rf1")
+    with pytest.raises(ValueError, match="Illegal"):
+        parse_san(game, "Qd4")
+
+    move, promotion = parse_san(game, "c8=N")
+    assert promotion == "N"
+    assert move_to_san(game, move, promotion) == "c8=N"
+    move, promotion = parse_san(game, "c8")
+    assert promotion == "Q"
+    assert move_to_san(game, move, promotion) == "c8=Q#"
+
+    rook, _ = parse_san(game, "Rdf1")
+    assert move_to_san(game, rook, None) == "Rdf1"
+    rook, _ = parse_san(game, "Rh2")
+    assert move_to_san(game, rook, None) == "Rh2"
+
+
+def test_format_game_round_trips_through_reader():
+    game = replay_game({"moves": ["e4", "e5", "Qh5", "Nc6", "Bc4", "Nf6", "Qxf7#"]})
+
+    text = format_game(game, {"White": "Me"})
+    assert '[Result "1-0"]' in text
+    assert text.rstrip().endswith("1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0")
+
+    record = next(read_games(io.StringIO(text)))
+    assert record["headers"]["White"] == "Me"
+    assert replay_game(record).to_fen() == game.to_fen()
+
+
+def test_writer_records_setup_fen_and_black_to_move():
+    fen = "4k3/8/8/8/8/8/4P3/4K3 b - - 0 40"
+    game = Game.from_fen(fen)
+    game.apply_uci_move("e8d7")
+    game.apply_uci_move("e2e4")
+
+    stream = io.StringIO()
+    write_game(stream, game)
+    text = stream.getvalue()
+    assert f'[FEN "{fen}"]' in text
+    assert "40... Kd7 41. e4 *" in text
+
+    record = next(read_games(io.StringIO(text)))
+    assert game_to_san(replay_game(record)) == ["Kd7", "e4"]
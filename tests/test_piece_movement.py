@@ -27,3 +27,29 @@ def test_bishop_can_capture_diagonal(game):
 
     row, col = convert_position("c6")
     assert game.board[row][col] == "wB"
+
+
+def test_start_position_has_twenty_legal_moves(game):
+    assert len(game.get_legal_moves("w")) == 20
+    assert game.has_any_legal_moves("w")
+
+
+def test_generated_moves_match_exhaustive_probe(game):
+    for start, end in (("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("g8", "f6")):
+        play_move(game, start, end)
+
+    generated = {
+        (move.sr, move.sc, move.dr, move.dc, promotion)
+        for move, promotion in game.get_legal_moves()
+    }
+
+    probed = set()
+    for sr in range(8):
+        for sc in range(8):
+            for dr in range(8):
+                for dc in range(8):
+                    move = game.build_move(sr, sc, dr, dc, color=game.turn)
+                    if move is not None and not game.would_leave_king_in_check(move):
+                        probed.add((sr, sc, dr, dc, None))
+
+    assert generated == probed
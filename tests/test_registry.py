@@ -0,0 +1,109 @@
+import threading
+
+from chess_engine.game import Game
+from chess_engine.registry import GameRegistry
+from web_app import app
+
+
+def test_registry_add_get_remove():
+    registry = GameRegistry(shard_count=4)
+    entries = {f"game-{index}": registry.add(f"game-{index}", Game()) for index in range(10)}
+
+    assert len(registry) == 10
+    for game_id, entry in entries.items():
+        assert registry.get(game_id) is entry
+
+    assert registry.remove("game-3") is entries["game-3"]
+    assert registry.get("game-3") is None
+    assert len(registry) == 9
+
+
+def test_concurrent_moves_on_one_game_are_serialized():
+    with app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+
+    statuses = []
+    barrier = threading.Barrier(8)
+
+    def play():
+        with app.test_client() as client:
+            barrier.wait()
+            response = client.post(f"/api/games/{game_id}/moves", json={"move": "e2e4"})
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=play) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200] + [400] * 7
+    with app.test_client() as client:
+        state = client.get(f"/api/games/{game_id}").get_json()
+    assert state["turn"] == "b"
+    assert state["board"][4][4] == "wP"
+
+
+def test_registry_evicts_least_recently_used_over_capacity():
+    evicted = []
+    registry = GameRegistry(
+        shard_count=1,
+        max_games=2,
+        idle_ttl=0,
+        on_evict=lambda game_id, entry, reason: evicted.append((game_id, reason)),
+    )
+    registry.add("a", Game())
+    registry.add("b", Game())
+    registry.get("a")
+    registry.add("c", Game())
+
+    assert registry.get("b") is None
+    assert registry.get("a") is not None
+    assert evicted == [("b", "capacity")]
+    assert registry.metrics()["evicted"]["capacity"] == 1
+
+
+def test_registry_capacity_is_global_across_shards():
+    evicted = []
+    registry = GameRegistry(
+        shard_count=16,
+        max_games=20,
+        idle_ttl=0,
+        on_evict=lambda game_id, entry, reason: evicted.append(game_id),
+    )
+    for index in range(20):
+        registry.add(f"game-{index}", Game())
+    assert len(registry) == 20
+    assert evicted == []
+
+    registry.get("game-0")
+    registry.add("game-20", Game())
+    registry.add("game-21", Game())
+
+    assert len(registry) == 20
+    assert evicted == ["game-1", "game-2"]
+    assert registry.get("game-0") is not None
+
+
+def test_registry_sweeps_idle_games():
+    registry = GameRegistry(shard_count=2, max_games=0, idle_ttl=60)
+    stale = registry.add("stale", Game())
+    registry.add("fresh", Game())
+    stale.last_access -= 120
+
+    assert registry.sweep() == 1
+    assert registry.get("stale") is None
+    assert registry.get("fresh") is not None
+
+    metrics = registry.metrics()
+    assert metrics["live"] == 1
+    assert metrics["evicted"]["idle"] == 1
+    assert metrics["created_total"] == 2
+
+
+def test_metrics_endpoint_reports_live_games():
+    with app.test_client() as client:
+        client.post("/api/games")
+        payload = client.get("/api/metrics").get_json()
+    assert payload["games"]["live"] >= 1
+    assert "evicted_total" in payload["games"]
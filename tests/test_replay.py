@@ -0,0 +1,76 @@
+import json
+
+from chess_engine.replay import main, validate_file, validate_record
+
+PGN = """[Event "Scholar"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0
+
+[Event "Past mate"]
+
+1. f3 e5 2. g4 Qh4# 3. a3 0-1
+
+[Event "Broken"]
+
+1. e4 e5 2. Ke3 *
+
+[Event "Shuffle"]
+
+1. Nf3 Nf6 2. Ng1 Ng8 3. Nf3 Nf6 4. Ng1 Ng8 *
+"""
+
+
+def test_validate_record_flags_moves_after_mate():
+    record = {"headers": {}, "moves": ["f3", "e5", "g4", "Qh4#", "a3"], "result": "0-1"}
+
+    result = validate_record(0, record)
+
+    assert result["status"] == "moves_after_end"
+    assert result["plies"] == 4
+    assert result["termination"] == "checkmate"
+    assert result["result"] == "0-1"
+
+
+def test_validate_file_streams_results_in_order(tmp_path):
+    source = tmp_path / "games.pgn"
+    source.write_text(PGN)
+    output = tmp_path / "results.jsonl"
+
+    stats = validate_file(str(source), str(output), workers=2, batch_size=1)
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [result["event"] for result in results] == ["Scholar", "Past mate", "Broken", "Shuffle"]
+    assert [result["status"] for result in results] == [
+        "ok",
+        "moves_after_end",
+        "illegal",
+        "ok",
+    ]
+    assert results[0]["termination"] == "checkmate"
+    assert results[2]["error"].startswith("Ply 3:")
+    assert results[3]["claimable_draws"] == ["threefold_repetition"]
+    assert stats["games"] == 4
+    assert stats["failed"] == 2
+    assert stats["plies"] == 7 + 4 + 2 + 8
+
+
+def test_cli_reports_failures_in_exit_code(tmp_path, capsys):
+    source = tmp_path / "games.pgn"
+    source.write_text(PGN.split('[Event "Past mate"]')[0])
+    output = tmp_path / "results.jsonl"
+
+    assert main([str(source), "-o", str(output), "--workers", "1"]) == 0
+    assert "1 games (1 ok, 0 failed)" in capsys.readouterr().out
+
+
+def test_replay_continues_past_a_claimable_repetition():
+    moves = "Nf3 Nf6 Ng1 Ng8 Nf3 Nf6 Ng1 Ng8 e4".split()
+
+    result = validate_record(0, {"headers": {}, "moves": moves})
+
+    assert result["status"] == "ok"
+    assert result["plies"] == 9
+    assert result["claimable_draws"] == []
@@ -0,0 +1,61 @@
+import os
+import signal
+import sys
+
+import chess
+import chess.engine
+import pytest
+
+from chess_engine.engine import _stockfish_choose_move
+from chess_engine.stockfish_pool import StockfishPool
+
+FAKE_UCI = [sys.executable, os.path.join(os.path.dirname(__file__), "fake_uci.py")]
+
+
+@pytest.fixture
+def pool():
+    pool = StockfishPool(command=FAKE_UCI, size=1)
+    yield pool
+    pool.close()
+
+
+def _new_games_seen(engine, game_key):
+    result = engine.play(
+        chess.Board(),
+        chess.engine.Limit(time=0.01),
+        game=game_key,
+        info=chess.engine.INFO_ALL,
+    )
+    return int(result.info["string"].split()[-1])
+
+
+def test_pool_reuses_engine_and_resets_between_games(pool):
+    with pool.lease() as engine:
+        first = engine
+        assert _new_games_seen(engine, "game-a") == 1
+        assert _new_games_seen(engine, "game-a") == 1
+
+    with pool.lease() as engine:
+        assert engine is first
+        assert _new_games_seen(engine, "game-b") == 2
+
+    assert pool.stats()["spawned"] == 1
+
+
+def test_pool_replaces_crashed_engine(pool):
+    with pool.lease() as engine:
+        os.kill(engine.transport.get_pid(), signal.SIGKILL)
+        engine.returncode.result(timeout=5)
+
+    with pool.lease() as engine:
+        assert _new_games_seen(engine, "game-c") == 1
+
+    stats = pool.stats()
+    assert stats["spawned"] == 2
+    assert stats["restarts"] == 1
+
+
+def test_stockfish_choose_move_uses_pool(game, pool):
+    assert _stockfish_choose_move(game, think_time_ms=50, pool=pool) == ("e2e4", "stockfish")
+    assert _stockfish_choose_move(game, think_time_ms=50, pool=pool) == ("e2e4", "stockfish")
+    assert pool.stats()["spawned"] == 1
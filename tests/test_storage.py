@@ -0,0 +1,169 @@
+import web_app
+from chess_engine.game import Game
+from chess_engine.storage import SQLiteGameStore, decode_game, encode_game
+
+from tests.helpers import play_move
+
+PROMOTION_LINE = [
+    ("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("c7", "c6"), ("d5", "c6"),
+    ("g8", "f6"), ("c6", "b7"), ("e7", "e6"), ("b7", "a8", "N"),
+]
+
+
+def _played_game(moves=PROMOTION_LINE):
+    game = Game()
+    for move in moves:
+        play_move(game, *move)
+    return game
+
+
+def test_encode_decode_round_trip():
+    game = _played_game()
+    start_fen, packed = encode_game(game)
+
+    assert len(packed) == 2 * len(PROMOTION_LINE)
+    restored = decode_game(start_fen, packed)
+    assert restored.to_fen() == game.to_fen()
+    assert restored.position_counts == game.position_counts
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "games.db")
+    game = _played_game()
+
+    store = SQLiteGameStore(path, flush_interval_ms=60000)
+    store.save("g1", game)
+    assert store.load("g1").to_fen() == game.to_fen()  # served from pending
+    store.close()
+
+    reopened = SQLiteGameStore(path, flush_interval_ms=0)
+    assert reopened.load("g1").to_fen() == game.to_fen()
+    reopened.delete("g1")
+    reopened.flush()
+    assert reopened.load("g1") is None
+    reopened.close()
+
+
+def test_zero_flush_interval_writes_through(tmp_path):
+    path = str(tmp_path / "games.db")
+    writer = SQLiteGameStore(path, flush_interval_ms=0)
+    reader = SQLiteGameStore(path, flush_interval_ms=0)
+    game = _played_game()
+
+    assert writer.save("g1", game)
+    restored = reader.load("g1")
+    assert restored.to_fen() == game.to_fen()
+    assert restored.version == game.version
+    writer.close()
+    reader.close()
+
+
+def test_stale_save_is_rejected(tmp_path):
+    path = str(tmp_path / "games.db")
+    first = SQLiteGameStore(path, flush_interval_ms=0)
+    second = SQLiteGameStore(path, flush_interval_ms=0)
+    first.save("g1", Game())
+
+    ahead, behind = first.load("g1"), second.load("g1")
+    play_move(ahead, "e2", "e4")
+    play_move(behind, "d2", "d4")
+
+    assert first.save("g1", ahead)
+    assert not second.save("g1", behind)
+    assert second.load("g1").to_fen() == ahead.to_fen()
+    first.close()
+    second.close()
+
+
+def test_sqlite_store_flushes_full_batches(tmp_path):
+    store = SQLiteGameStore(str(tmp_path / "games.db"), batch_size=2, flush_interval_ms=60000)
+    store.save("a", Game())
+    store.save("b", Game())
+    assert store._pending == {}
+    store.close()
+
+
+def test_api_rehydrates_game_from_store(tmp_path, monkeypatch):
+    store = SQLiteGameStore(str(tmp_path / "games.db"), flush_interval_ms=0)
+    monkeypatch.setattr(web_app, "_store", store)
+
+    with web_app.app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+        client.post(f"/api/games/{game_id}/moves", json={"move": "e2e4"})
+
+        web_app._registry.remove(game_id)
+        created = web_app._registry.metrics()["created_total"]
+        state = client.get(f"/api/games/{game_id}").get_json()
+        assert web_app._registry.metrics()["created_total"] == created
+
+    assert state["turn"] == "b"
+    assert state["board"][4][4] == "wP"
+    store.close()
+
+
+def _other_worker_plays(path, game_id, *move):
+    other_worker = SQLiteGameStore(path, flush_interval_ms=0)
+    game = other_worker.load(game_id)
+    play_move(game, *move)
+    assert other_worker.save(game_id, game)
+    other_worker.close()
+
+
+def test_api_reloads_games_saved_by_another_worker(tmp_path, monkeypatch):
+    path = str(tmp_path / "games.db")
+    store = SQLiteGameStore(path, flush_interval_ms=0)
+    monkeypatch.setattr(web_app, "_store", store)
+
+    with web_app.app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+        _other_worker_plays(path, game_id, "d2", "d4")
+
+        state = client.get(f"/api/games/{game_id}").get_json()
+        assert state["version"] == 1
+        assert state["board"][4][3] == "wP"
+        moved = client.post(f"/api/games/{game_id}/moves", json={"move": "d7d5"})
+        assert moved.status_code == 200
+
+    store.close()
+
+
+def test_api_rejects_moves_on_a_stale_copy(tmp_path, monkeypatch):
+    path = str(tmp_path / "games.db")
+    store = SQLiteGameStore(path, flush_interval_ms=0)
+    monkeypatch.setattr(web_app, "_store", store)
+
+    with web_app.app.test_client() as client:
+        game_id = client.post("/api/games").get_json()["game_id"]
+        subscription = web_app._events.subscribe(game_id)
+        _other_worker_plays(path, game_id, "d2", "d4")
+        # The other save lands after this worker checked the stored version.
+        monkeypatch.setattr(store, "version", lambda game_id: None)
+
+        stale = client.post(f"/api/games/{game_id}/moves", json={"move": "e2e4"})
+        assert stale.status_code == 409
+        assert subscription.get_nowait() is None
+        assert web_app._registry.get(game_id) is None
+
+        state = client.get(f"/api/games/{game_id}").get_json()
+
+    assert state["board"][4][3] == "wP"
+    assert state["board"][4][4] == "."
+    store.close()
+
+
+def test_batched_store_reports_stale_writes_at_flush(tmp_path):
+    path = str(tmp_path / "games.db")
+    stale = []
+    store = SQLiteGameStore(path, flush_interval_ms=60000, on_stale=stale.append)
+    store.save("g1", Game())
+    store.flush()
+    _other_worker_plays(path, "g1", "e2", "e4")
+
+    game = Game()
+    play_move(game, "d2", "d4")
+    assert store.save("g1", game)
+    store.flush()
+
+    assert stale == ["g1"]
+    assert store.load("g1").board[4][4] == "wP"
+    store.close()
@@ -55,3 +55,30 @@ def test_undo_api_no_moves():
 
         undo = client.post(f"/api/games/{game_id}/undo", json={"steps": 1})
         assert undo.status_code == 400
+
+
+def test_make_unmake_restores_position():
+    game = Game()
+    play_move(game, "e2", "e4")
+    play_move(game, "d7", "d5")
+    fen = game.to_fen()
+    counts = dict(game.position_counts)
+
+    for move, promotion in game.get_legal_moves():
+        record = game.make_move(move, promotion)
+        game.unmake_move(record)
+        assert game.to_fen() == fen
+        assert game.position_counts == counts
+
+
+def test_version_moves_forward_on_commit_and_undo(game):
+    assert game.version == 0
+    play_move(game, "e2", "e4")
+    play_move(game, "e7", "e5")
+    assert game.version == 2
+
+    game.undo_last_move(2)
+    assert game.version == 3
+    assert game.undo_last_move() == 0
+    assert game.version == 3
+    assert game.copy().version == 3
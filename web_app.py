@@ -1,22 +1,41 @@
-import threading
+import json
+import queue
 import uuid
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 
 from chess_engine.constants import PROMOTION_OPTIONS
-from chess_engine.engine import choose_engine_move
+from chess_engine.engine import (
+    DEFAULT_ANALYSIS_TIME_MS,
+    MAX_SEARCH_DEPTH,
+    analyze_positions,
+    choose_engine_move,
+    score_positions,
+    transposition_table_stats,
+)
+from chess_engine.events import EventBroker, board_changes
 from chess_engine.game import Game
+from chess_engine.jobs import JobQueue, QueueFullError
 from chess_engine.notation import convert_position, parse_move_input
+from chess_engine.registry import GameRegistry
 from chess_engine.rules.promotion import normalize_promotion_choice
+from chess_engine.storage import open_store_from_env
+from chess_engine.stockfish_pool import get_stockfish_pool
 
 app = Flask(__name__, static_folder="frontend", static_url_path="/")
 
-_games = {}
-_games_lock = threading.Lock()
+_events = EventBroker()
+_registry = GameRegistry(on_evict=lambda game_id, entry, reason: _events.forget(game_id))
+_registry.start_sweeper()
+_store = open_store_from_env(on_stale=lambda game_id: _drop_stale_game(game_id))
+_engine_jobs = JobQueue()
 
-
-def _opponent(color):
-    return "b" if color == "w" else "w"
+DEFAULT_JOB_TIMEOUT_MS = 30000
+MAX_JOB_TIMEOUT_MS = 120000
+MAX_LONG_POLL_MS = 30000
+MAX_BATCH_POSITIONS = 256
+MAX_STATIC_BATCH_POSITIONS = 4096
+STALE_GAME_ERROR = ("Game was changed by another worker; reload it.", 409)
 
 
 def _square_name(row, col):
@@ -25,80 +44,7 @@ def _square_name(row, col):
 
 
 def _serialize_outcome(game):
-    side_to_move = game.turn
-    check = game.is_in_check(side_to_move)
-
-    if game.is_checkmate(side_to_move):
-        winner = _opponent(side_to_move)
-        return {
-            "ended": True,
-            "result": "checkmate",
-            "winner": winner,
-            "message": f"Checkmate! {winner.upper()} wins.",
-            "check": True,
-        }
-
-    if game.is_stalemate(side_to_move):
-        return {
-            "ended": True,
-            "result": "stalemate",
-            "winner": None,
-            "message": "Draw by stalemate.",
-            "check": False,
-        }
-
-    if game.is_insufficient_material():
-        return {
-            "ended": True,
-            "result": "insufficient_material",
-            "winner": None,
-            "message": "Draw by insufficient material.",
-            "check": check,
-        }
-
-    if game.is_fivefold_repetition():
-        return {
-            "ended": True,
-            "result": "fivefold_repetition",
-            "winner": None,
-            "message": "Draw by fivefold repetition.",
-            "check": check,
-        }
-
-    if game.is_seventy_five_move_draw():
-        return {
-            "ended": True,
-            "result": "seventy_five_move_rule",
-            "winner": None,
-            "message": "Draw by seventy-five-move rule.",
-            "check": check,
-        }
-
-    if game.is_threefold_repetition():
-        return {
-            "ended": True,
-            "result": "threefold_repetition",
-            "winner": None,
-            "message": "Draw by threefold repetition.",
-            "check": check,
-        }
-
-    if game.is_fifty_move_draw():
-        return {
-            "ended": True,
-            "result": "fifty_move_rule",
-            "winner": None,
-            "message": "Draw by fifty-move rule.",
-            "check": check,
-        }
-
-    return {
-        "ended": False,
-        "result": None,
-        "winner": None,
-        "message": f"{side_to_move.upper()} to move.",
-        "check": check,
-    }
+    return game.get_outcome()
 
 
 def _serialize_state(game_id, game, extra_message=None):
@@ -112,6 +58,7 @@ def _serialize_state(game_id, game, extra_message=None):
 
     return {
         "game_id": game_id,
+        "version": game.version,
         "board": game.board,
         "turn": game.turn,
         "fullmove_number": game.fullmove_number,
@@ -123,6 +70,7 @@ def _serialize_state(game_id, game, extra_message=None):
         "result": outcome["result"],
         "winner": outcome["winner"],
         "message": message.strip(),
+        "legal_moves": game.get_legal_move_map(),
     }
 
 
@@ -136,12 +84,121 @@ def _with_move_metadata(state_payload, played_move=None, move_side=None, move_so
     return state_payload
 
 
-def _get_game_or_404(game_id):
-    with _games_lock:
-        game = _games.get(game_id)
-    if game is None:
+def _drop_stale_game(game_id):
+    # Subscribers are closed and reconnect for a snapshot of the stored game.
+    _registry.remove(game_id)
+    _events.forget(game_id)
+
+
+def _refresh_if_stale(game_id, entry):
+    # Another worker may have saved a newer version since this copy was
+    # cached; swap it in place so holders of the entry keep the same lock.
+    stored = _store.version(game_id)
+    if stored is None or stored <= entry.game.version:
+        return
+    with entry.lock:
+        if stored <= entry.game.version:
+            return
+        try:
+            game = _store.load(game_id)
+        except ValueError:
+            game = None
+        if game is not None:
+            entry.game = game
+            _events.forget(game_id)
+
+
+def _get_entry_or_404(game_id):
+    entry = _registry.get(game_id)
+    if entry is not None and _store is not None:
+        _refresh_if_stale(game_id, entry)
+    if entry is None and _store is not None:
+        try:
+            game = _store.load(game_id)
+        except ValueError:
+            game = None
+        if game is not None:
+            entry = _registry.add(game_id, game, replace=False, created=False)
+    if entry is None:
         return None, (jsonify({"error": "Game not found."}), 404)
-    return game, None
+    return entry, None
+
+
+def _persist(game_id, game):
+    # False means another worker already saved a newer version of this game.
+    # The stale cached copy is dropped so the next request reloads it.
+    if _store is None or _store.save(game_id, game):
+        return True
+    _drop_stale_game(game_id)
+    return False
+
+
+def _client_id():
+    return (request.headers.get("X-Client-Id") or "").strip()[:64] or None
+
+
+def _snapshot_board(game):
+    return [row[:] for row in game.board]
+
+
+def _publish(game_id, game, before, kind, move=None, undone_steps=None, origin=None):
+    # Push a delta rather than the full state: only the squares that changed,
+    # plus the clocks and outcome a client needs to stay in sync.
+    outcome = _serialize_outcome(game)
+    event = {
+        "type": kind,
+        "game_id": game_id,
+        "version": game.version,
+        "squares": board_changes(before, game.board),
+        "move": move,
+        "turn": game.turn,
+        "fullmove_number": game.fullmove_number,
+        "halfmove_clock": game.halfmove_clock,
+        "castling_rights": dict(game.castling_rights),
+        "en_passant_target": game.en_passant_target,
+        "check": outcome["check"],
+        "ended": outcome["ended"],
+        "result": outcome["result"],
+        "winner": outcome["winner"],
+        "message": outcome["message"],
+        "origin": origin,
+    }
+    if undone_steps is not None:
+        event["undone_steps"] = undone_steps
+    _events.publish(game_id, event)
+
+
+def _state_etag(game):
+    # The hash guards against a version number being reused after a game
+    # is reloaded from the store with a fresh counter.
+    return f"{game.version}-{game.position_hash:016x}"
+
+
+def _changes_since(game_id, game, since):
+    try:
+        since = int(since)
+    except (TypeError, ValueError):
+        since = -1
+
+    if since == game.version:
+        changes = []
+    elif 0 <= since < game.version:
+        changes = _events.events_since(game_id, since)
+    else:
+        changes = None
+
+    if changes is None:
+        return _serialize_state(game_id, game)
+    return {
+        "game_id": game_id,
+        "version": game.version,
+        "since": since,
+        "changes": changes,
+    }
+
+
+def _format_event(name, payload):
+    return f"event: {name}\ndata: {json.dumps(payload)}\n\n"
 
 
 def _parse_level(value):
@@ -185,205 +242,456 @@ def index():
 
 @app.post("/api/games")
 def create_game():
-    game_id = str(uuid.uuid4())
-    game = Game()
+    payload = request.get_json(silent=True) or {}
+    fen = payload.get("fen")
+    if fen is not None and not isinstance(fen, str):
+        return jsonify({"error": "FEN must be a string."}), 400
+    try:
+        game = Game.from_fen(fen) if fen else Game()
+    except ValueError as exc:
+        return jsonify({"error": f"Invalid FEN: {exc}"}), 400
 
-    with _games_lock:
-        _games[game_id] = game
+    game_id = str(uuid.uuid4())
+    entry = _registry.add(game_id, game)
 
-    return jsonify(_serialize_state(game_id, game))
+    with entry.lock:
+        _persist(game_id, entry.game)
+        return jsonify(_serialize_state(game_id, entry.game))
 
 
 @app.get("/api/games/<game_id>")
 def get_game(game_id):
-    game, error = _get_game_or_404(game_id)
+    entry, error = _get_entry_or_404(game_id)
+    if error:
+        return error
+
+    since = request.args.get("since")
+
+    with entry.lock:
+        game = entry.game
+        etag = _state_etag(game)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        elif since is not None:
+            response = jsonify(_changes_since(game_id, game, since))
+        else:
+            response = jsonify(_serialize_state(game_id, game))
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.get("/api/games/<game_id>/events")
+def game_events(game_id):
+    entry, error = _get_entry_or_404(game_id)
     if error:
         return error
-    return jsonify(_serialize_state(game_id, game))
+
+    # Subscribe under the lock so no delta can slip in between the snapshot
+    # and the first queued event.
+    with entry.lock:
+        subscription = _events.subscribe(game_id)
+        initial = _serialize_state(game_id, entry.game)
+
+    def stream():
+        try:
+            yield _format_event("state", initial)
+            while True:
+                try:
+                    event = subscription.get(timeout=_events.heartbeat_seconds)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield _format_event("delta", event)
+        finally:
+            _events.unsubscribe(game_id, subscription)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/games/<game_id>/reset")
 def reset_game(game_id):
-    _, error = _get_game_or_404(game_id)
+    entry, error = _get_entry_or_404(game_id)
     if error:
         return error
 
-    game = Game()
-    with _games_lock:
-        _games[game_id] = game
-
-    return jsonify(_serialize_state(game_id, game, extra_message="Game reset."))
+    with entry.lock:
+        before = _snapshot_board(entry.game)
+        version = entry.game.version
+        entry.game = Game()
+        entry.game.version = version + 1
+        if not _persist(game_id, entry.game):
+            return jsonify({"error": STALE_GAME_ERROR[0]}), STALE_GAME_ERROR[1]
+        _publish(game_id, entry.game, before, "reset", origin=_client_id())
+        return jsonify(_serialize_state(game_id, entry.game, extra_message="Game reset."))
 
 
 @app.post("/api/games/<game_id>/moves")
 def make_move(game_id):
-    game, error = _get_game_or_404(game_id)
+    entry, error = _get_entry_or_404(game_id)
     if error:
         return error
 
-    if _serialize_outcome(game)["ended"]:
-        return jsonify({"error": "Game is already finished."}), 400
-
     payload = request.get_json(silent=True) or {}
 
-    start = payload.get("start")
-    end = payload.get("end")
-    promotion = payload.get("promotion")
-    move_text = payload.get("move")
-
-    try:
-        if move_text:
-            start, end, parsed_promotion = parse_move_input(move_text, game.turn)
-            if promotion is None:
-                promotion = parsed_promotion
-
-        if not start or not end:
-            raise ValueError("Missing start/end.")
-
-        start_row, start_col = convert_position(start)
-        end_row, end_col = convert_position(end)
-    except ValueError:
-        return jsonify({"error": "Invalid move input."}), 400
-
-    piece = game.board[start_row][start_col]
-    if piece == "." or piece[0] != game.turn:
-        return jsonify({"error": "Invalid piece selection."}), 400
-
-    move = game.build_move(start_row, start_col, end_row, end_col, color=game.turn)
-    if move is None:
-        return jsonify({"error": "Invalid move."}), 400
-
-    promotion = normalize_promotion_choice(promotion)
-    if move.promotion and promotion not in PROMOTION_OPTIONS:
+    with entry.lock:
+        game = entry.game
+
+        if _serialize_outcome(game)["ended"]:
+            return jsonify({"error": "Game is already finished."}), 400
+
+        start = payload.get("start")
+        end = payload.get("end")
+        promotion = payload.get("promotion")
+        move_text = payload.get("move")
+
+        try:
+            if move_text:
+                start, end, parsed_promotion = parse_move_input(move_text, game.turn)
+                if promotion is None:
+                    promotion = parsed_promotion
+
+            if not start or not end:
+                raise ValueError("Missing start/end.")
+
+            start_row, start_col = convert_position(start)
+            end_row, end_col = convert_position(end)
+        except ValueError:
+            return jsonify({"error": "Invalid move input."}), 400
+
+        piece = game.board[start_row][start_col]
+        if piece == "." or piece[0] != game.turn:
+            return jsonify({"error": "Invalid piece selection."}), 400
+
+        move = game.build_move(start_row, start_col, end_row, end_col, color=game.turn)
+        if move is None:
+            return jsonify({"error": "Invalid move."}), 400
+
+        promotion = normalize_promotion_choice(promotion)
+        if move.promotion and promotion not in PROMOTION_OPTIONS:
+            return jsonify(
+                {
+                    "error": "Promotion required. Choose Q, R, B, or N.",
+                    "promotion_required": True,
+                }
+            ), 400
+
+        if not move.promotion:
+            promotion = None
+
+        if game.would_leave_king_in_check(move, promotion):
+            return jsonify({"error": "Illegal move: king would be in check."}), 400
+
+        move_side = game.turn
+        before = _snapshot_board(game)
+        game.commit_move(move, promotion)
+        if not _persist(game_id, game):
+            return jsonify({"error": STALE_GAME_ERROR[0]}), STALE_GAME_ERROR[1]
+
+        played_token = f"{start.lower()}{end.lower()}"
+        played = f"{start.lower()}->{end.lower()}"
+        if promotion:
+            played_token = f"{played_token}{promotion.lower()}"
+            played = f"{played}={promotion}"
+        _publish(game_id, game, before, "move", move=played_token, origin=_client_id())
+
+        state = _serialize_state(game_id, game, extra_message=f"Played {played}.")
         return jsonify(
-            {
-                "error": "Promotion required. Choose Q, R, B, or N.",
-                "promotion_required": True,
-            }
-        ), 400
-
-    if not move.promotion:
-        promotion = None
-
-    if game.would_leave_king_in_check(move, promotion):
-        return jsonify({"error": "Illegal move: king would be in check."}), 400
-
-    move_side = game.turn
-    game.commit_move(move, promotion)
-
-    played_token = f"{start.lower()}{end.lower()}"
-    played = f"{start.lower()}->{end.lower()}"
-    if promotion:
-        played_token = f"{played_token}{promotion.lower()}"
-        played = f"{played}={promotion}"
-
-    state = _serialize_state(game_id, game, extra_message=f"Played {played}.")
-    return jsonify(
-        _with_move_metadata(
-            state,
-            played_move=played_token,
-            move_side=move_side,
-            move_source="player",
+            _with_move_metadata(
+                state,
+                played_move=played_token,
+                move_side=move_side,
+                move_source="player",
+            )
         )
-    )
 
 
 @app.get("/api/games/<game_id>/legal-moves")
 def legal_moves(game_id):
-    game, error = _get_game_or_404(game_id)
+    entry, error = _get_entry_or_404(game_id)
     if error:
         return error
 
     start = (request.args.get("from") or "").strip().lower()
+
+    with entry.lock:
+        move_map = entry.game.get_legal_move_map()
+
+    if not start:
+        return jsonify({"moves": move_map})
+
     try:
-        sr, sc = convert_position(start)
+        convert_position(start)
     except ValueError:
         return jsonify({"from": start, "targets": []})
 
-    piece = game.board[sr][sc]
-    if piece == "." or piece[0] != game.turn:
-        return jsonify({"from": start, "targets": []})
+    targets = move_map.get(start, [])
+    return jsonify(
+        {
+            "from": start,
+            "targets": [target["to"] for target in targets],
+            "promotions": [target["to"] for target in targets if target["promotion"]],
+        }
+    )
 
-    targets = []
-    for dr in range(8):
-        for dc in range(8):
-            move = game.build_move(sr, sc, dr, dc, color=game.turn)
-            if move is None:
-                continue
-
-            if move.promotion:
-                can_play = False
-                for promotion in PROMOTION_OPTIONS:
-                    if not game.would_leave_king_in_check(move, promotion):
-                        can_play = True
-                        break
-                if not can_play:
-                    continue
-            else:
-                if game.would_leave_king_in_check(move):
-                    continue
 
-            targets.append(_square_name(dr, dc))
+def _parse_bool(value, default=True):
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in {"0", "false", "no", "off"}
+    return bool(value)
 
-    return jsonify({"from": start, "targets": targets})
 
+def _parse_engine_options(payload):
+    level, skill_level, think_time_ms = _normalize_engine_knobs(
+        payload.get("level", "hard"),
+        payload.get("skill_level"),
+        payload.get("think_time_ms"),
+    )
+    return {
+        "level": level,
+        "skill_level": skill_level,
+        "think_time_ms": think_time_ms,
+        "use_stockfish": _parse_bool(payload.get("use_stockfish", True)),
+        "use_book": _parse_bool(payload.get("use_book", True)),
+    }
 
-@app.post("/api/games/<game_id>/engine-move")
-def engine_move(game_id):
-    game, error = _get_game_or_404(game_id)
-    if error:
-        return error
 
-    if _serialize_outcome(game)["ended"]:
-        return jsonify({"error": "Game is already finished."}), 400
+def _parse_job_timeout(value):
+    try:
+        parsed = int(value) if value is not None else DEFAULT_JOB_TIMEOUT_MS
+    except (TypeError, ValueError):
+        parsed = DEFAULT_JOB_TIMEOUT_MS
+    return max(1000, min(MAX_JOB_TIMEOUT_MS, parsed))
 
-    payload = request.get_json(silent=True) or {}
-    level = payload.get("level", "hard")
-    skill_level = payload.get("skill_level")
-    think_time_ms = payload.get("think_time_ms")
-    level, skill_level, think_time_ms = _normalize_engine_knobs(level, skill_level, think_time_ms)
-    use_stockfish = payload.get("use_stockfish", True)
-    if isinstance(use_stockfish, str):
-        use_stockfish = use_stockfish.strip().lower() not in {"0", "false", "no", "off"}
-    else:
-        use_stockfish = bool(use_stockfish)
 
+def _choose_engine_move(game, options, game_key=None, should_stop=None):
     try:
         move_token, source = choose_engine_move(
             game,
-            skill_level=skill_level,
-            think_time_ms=think_time_ms,
-            use_stockfish=use_stockfish,
-            level=level,
+            game_key=game_key,
+            should_stop=should_stop,
+            **options,
         )
     except Exception:
-        return jsonify({"error": "Engine failed to choose a move."}), 500
+        return None, None, ("Engine failed to choose a move.", 500)
 
     if not move_token:
-        return jsonify({"error": "No legal engine move available."}), 400
+        return None, None, ("No legal engine move available.", 400)
+    return move_token, source, None
+
 
+def _apply_engine_move(game_id, game, move_token, source, origin=None):
     move_side = game.turn
+    before = _snapshot_board(game)
     if not game.apply_uci_move(move_token):
-        return jsonify({"error": "Engine produced an invalid move."}), 500
+        return None, ("Engine produced an invalid move.", 500)
+    if not _persist(game_id, game):
+        return None, STALE_GAME_ERROR
+    _publish(game_id, game, before, "move", move=move_token, origin=origin)
 
     state = _serialize_state(
         game_id,
         game,
         extra_message=f"Engine ({source}) played {move_token}.",
     )
-    return jsonify(
+    return (
         _with_move_metadata(
             state,
             played_move=move_token,
             move_side=move_side,
             move_source=source,
+        ),
+        None,
+    )
+
+
+def _commit_engine_move(game_id, entry, game, expected_fen, move_token, source, origin=None):
+    # The search ran without the game lock, so only apply its move if nobody
+    # moved, undid or reset in the meantime.
+    with entry.lock:
+        if entry.game is not game or game.to_fen() != expected_fen:
+            return None, ("Game changed while the engine was thinking.", 409)
+        return _apply_engine_move(game_id, game, move_token, source, origin)
+
+
+def _submit_engine_job(game_id, entry, game, snapshot, options, timeout_ms, origin=None):
+    expected_fen = snapshot.to_fen()
+
+    def run(job):
+        move_token, source, error = _choose_engine_move(
+            snapshot,
+            options,
+            game_key=id(game),
+            should_stop=job.should_stop,
         )
+        if error:
+            raise RuntimeError(error[0])
+
+        job.raise_if_stopped()
+        state, error = _commit_engine_move(
+            game_id,
+            entry,
+            game,
+            expected_fen,
+            move_token,
+            source,
+            origin,
+        )
+        if error:
+            raise RuntimeError(error[0])
+        return state
+
+    return _engine_jobs.submit(run, timeout_ms, metadata={"game_id": game_id})
+
+
+@app.post("/api/games/<game_id>/engine-move")
+def engine_move(game_id):
+    entry, error = _get_entry_or_404(game_id)
+    if error:
+        return error
+
+    payload = request.get_json(silent=True) or {}
+    options = _parse_engine_options(payload)
+
+    with entry.lock:
+        game = entry.game
+        if _serialize_outcome(game)["ended"]:
+            return jsonify({"error": "Game is already finished."}), 400
+        snapshot = game.copy()
+
+    if _parse_bool(payload.get("async"), default=False):
+        try:
+            job = _submit_engine_job(
+                game_id,
+                entry,
+                game,
+                snapshot,
+                options,
+                _parse_job_timeout(payload.get("timeout_ms")),
+                origin=_client_id(),
+            )
+        except QueueFullError as exc:
+            return jsonify({"error": str(exc)}), 503
+        return jsonify(job.to_dict()), 202
+
+    move_token, source, error = _choose_engine_move(snapshot, options, game_key=id(game))
+    if error:
+        return jsonify({"error": error[0]}), error[1]
+
+    state, error = _commit_engine_move(
+        game_id,
+        entry,
+        game,
+        snapshot.to_fen(),
+        move_token,
+        source,
+        _client_id(),
+    )
+    if error:
+        return jsonify({"error": error[0]}), error[1]
+    return jsonify(state)
+
+
+@app.get("/api/jobs/<job_id>")
+def get_job(job_id):
+    job = _engine_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+
+    try:
+        wait_ms = int(request.args.get("wait", 0))
+    except (TypeError, ValueError):
+        wait_ms = 0
+    wait_ms = max(0, min(MAX_LONG_POLL_MS, wait_ms))
+    if wait_ms:
+        job.wait(wait_ms / 1000.0)
+
+    return jsonify(job.to_dict())
+
+
+@app.delete("/api/jobs/<job_id>")
+def cancel_job(job_id):
+    job = _engine_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job.to_dict())
+
+
+@app.post("/api/analysis/batch")
+def analyze_batch():
+    payload = request.get_json(silent=True) or {}
+    positions = payload.get("positions")
+    if not isinstance(positions, list) or not positions:
+        return jsonify({"error": "positions must be a non-empty list."}), 400
+
+    mode = (payload.get("mode") or "search").strip().lower()
+    if mode not in {"search", "static"}:
+        return jsonify({"error": "mode must be 'search' or 'static'."}), 400
+
+    limit = MAX_STATIC_BATCH_POSITIONS if mode == "static" else MAX_BATCH_POSITIONS
+    if len(positions) > limit:
+        return jsonify({"error": f"At most {limit} positions per {mode} batch."}), 400
+
+    if mode == "static":
+        try:
+            results = score_positions(positions)
+        except Exception:
+            return jsonify({"error": "Analysis failed."}), 500
+        return jsonify({"results": results})
+
+    try:
+        think_time_ms = int(payload.get("think_time_ms", DEFAULT_ANALYSIS_TIME_MS))
+    except (TypeError, ValueError):
+        think_time_ms = DEFAULT_ANALYSIS_TIME_MS
+    think_time_ms = max(30, min(3000, think_time_ms))
+
+    try:
+        max_depth = int(payload["max_depth"]) if payload.get("max_depth") is not None else None
+    except (TypeError, ValueError):
+        max_depth = None
+    if max_depth is not None:
+        max_depth = max(1, min(MAX_SEARCH_DEPTH, max_depth))
+
+    try:
+        results = analyze_positions(positions, think_time_ms=think_time_ms, max_depth=max_depth)
+    except Exception:
+        return jsonify({"error": "Analysis failed."}), 500
+    return jsonify({"results": results})
+
+
+@app.get("/api/engine/stats")
+def engine_stats():
+    return jsonify(
+        {
+            "transposition_table": transposition_table_stats(),
+            "stockfish_pool": get_stockfish_pool().stats(),
+        }
+    )
+
+
+@app.get("/api/metrics")
+def metrics():
+    return jsonify(
+        {
+            "games": _registry.metrics(),
+            "engine_jobs": {"pending": _engine_jobs.pending_count()},
+            "event_subscribers": _events.subscriber_count(),
+        }
     )
 
 
 @app.post("/api/games/<game_id>/undo")
 def undo_move(game_id):
-    game, error = _get_game_or_404(game_id)
+    entry, error = _get_entry_or_404(game_id)
     if error:
         return error
 
@@ -396,13 +704,21 @@ def undo_move(game_id):
         steps = 1
 
     steps = max(1, min(10, steps))
-    undone = game.undo_last_move(steps)
-    if undone == 0:
-        return jsonify({"error": "No moves to undo."}), 400
 
-    state = _serialize_state(game_id, game, extra_message=f"Undid {undone} move(s).")
-    state["undone_steps"] = undone
-    return jsonify(state)
+    with entry.lock:
+        game = entry.game
+
+        before = _snapshot_board(game)
+        undone = game.undo_last_move(steps)
+        if undone == 0:
+            return jsonify({"error": "No moves to undo."}), 400
+        if not _persist(game_id, game):
+            return jsonify({"error": STALE_GAME_ERROR[0]}), STALE_GAME_ERROR[1]
+        _publish(game_id, game, before, "undo", undone_steps=undone, origin=_client_id())
+
+        state = _serialize_state(game_id, game, extra_message=f"Undid {undone} move(s).")
+        state["undone_steps"] = undone
+        return jsonify(state)
 
 
 if __name__ == "__main__":